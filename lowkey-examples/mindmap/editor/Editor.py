@@ -29,6 +29,7 @@ class Editor(Client):
     def __init__(self):
         super().__init__()
         self._session = MindmapSession()
+        self._session.getMindMapModel().makeThreadSafe()  # updated by the connection thread and read by the editor thread
         self._parser = DSLParser()
     
     def run(self):
@@ -3,6 +3,7 @@ import enum
 import logging
 import time
 
+from lowkey.collabtypes.HybridLogicalClock import HybridLogicalClock
 
 __author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -11,12 +12,19 @@ __license__ = "GPL-3.0"
 
 """
 Clock facility supporting DEBUG mode without boilerplate.
+
+In HLC mode, timestamps are issued by a hybrid logical clock: they are strictly increasing and unique across
+replicas without sleeping between writes, so sleepOneStep does nothing. The HLC mode requires the unique id of the
+replica (see HybridLogicalClock). The clock does not receive the timestamps
+of other replicas by itself, as the messages of the Collab API and the network components carry none: components
+integrating the state of other replicas have to observe its timestamps, so that later local timestamps come after them.
 """
 
 
 class ClockMode(enum.Enum):
     REAL = 0
     DEBUG = 1
+    HLC = 2
 
 
 class Clock:
@@ -25,17 +33,26 @@ class Clock:
     __instance = None
     __mode = ClockMode.REAL
     __debugTime = 0
+    __hybridLogicalClock = None
     
     @staticmethod
-    def setUp(mode=ClockMode.REAL):
+    def setUp(mode=ClockMode.REAL, replicaId=None):
         if Clock.__instance == None:
-            Clock(mode)
+            Clock(mode, replicaId)
         return Clock.__instance
     
-    def __init__(self, mode):
+    @staticmethod
+    def tearDown():
+        """Discards the clock, so that the next setUp can choose another mode, e.g., between tests."""
+        Clock.__instance = None
+        Clock.__mode = ClockMode.REAL
+    
+    def __init__(self, mode, replicaId=None):
         if Clock.__instance != None:
             raise Exception("This class is a singleton!")
         else:
+            if mode == ClockMode.HLC:
+                self.__hybridLogicalClock = HybridLogicalClock(replicaId)
             Clock.__instance = self
             Clock.__mode = mode
             if mode == ClockMode.DEBUG:
@@ -50,13 +67,21 @@ class Clock:
         return self.__step
     
     def sleepOneStep(self):
-        time.sleep(1 / self.__step)
+        if self.__mode != ClockMode.HLC:
+            time.sleep(1 / self.__step)
     
     def currentTime(self):
         if self.__mode == ClockMode.REAL:
             return self.__currentRealTime()
         if self.__mode == ClockMode.DEBUG:
             return self.__currentDebugTime()
+        if self.__mode == ClockMode.HLC:
+            return self.__hybridLogicalClock.now()
+    
+    def observe(self, timestamp: int):
+        """Observes a timestamp received from another replica. Only the HLC mode keeps track of remote timestamps."""
+        if self.__mode == ClockMode.HLC:
+            self.__hybridLogicalClock.observe(timestamp)
         
     def __currentRealTime(self):
         return time.time_ns()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+import threading
+import time
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Hybrid logical clock, based on https://cse.buffalo.edu/tech-reports/2014-04.pdf.
+
+Issues strictly increasing timestamps without sleeping. A timestamp packs the physical time in milliseconds, a
+logical counter and the id of the replica into a single integer, in this order of significance. The counter
+orders the timestamps issued within the same millisecond, or while the physical time lags behind the latest
+timestamp, and the replica id breaks the ties between the replicas, so that timestamps are globally unique as
+long as the replica ids are. Replica ids are thus not drawn at random, as collisions in their few bits would be
+likely, but assigned to the replicas by the application, which has to keep them unique. Observing the timestamps of other replicas keeps the later local timestamps after them.
+
+Timestamps fit in 63 bits (PHYSICAL_BITS + COUNTER_BITS + REPLICA_BITS), i.e., in signed 64-bit integers such as
+the timestamp columns of LWWColumnarSet, until the physical time overflows its bits in the year 2109.
+"""
+
+PHYSICAL_BITS = 42
+COUNTER_BITS = 8
+REPLICA_BITS = 13
+
+
+class HybridLogicalClock():
+    
+    def __init__(self, replicaId: int):
+        if replicaId is None:
+            raise Exception("A unique replica id is required.")
+        if not 0 <= replicaId < 1 << REPLICA_BITS:
+            raise Exception("Replica id out of range.")
+        
+        self.__replicaId = replicaId
+        self.__physicalTime = 0  # latest physical time component
+        self.__counter = 0  # logical counter within the latest physical time
+        self.__lock = threading.Lock()
+    
+    """Interface methods"""
+    
+    def getReplicaId(self):
+        return self.__replicaId
+    
+    def now(self) -> int:
+        """Issues a timestamp later than every timestamp issued or observed before."""
+        with self.__lock:
+            physicalTime = time.time_ns() // 1000000
+            if physicalTime > self.__physicalTime:
+                self.__physicalTime = physicalTime
+                self.__counter = 0
+            else:
+                self.__increment()
+            return self.pack(self.__physicalTime, self.__counter, self.__replicaId)
+    
+    def observe(self, timestamp: int):
+        """Advances the clock past a timestamp received from another replica."""
+        physicalTime, counter, _replicaId = self.unpack(timestamp)
+        with self.__lock:
+            if (physicalTime, counter) > (self.__physicalTime, self.__counter):
+                self.__physicalTime = physicalTime
+                self.__counter = counter
+    
+    @staticmethod
+    def pack(physicalTime: int, counter: int, replicaId: int) -> int:
+        return (((physicalTime << COUNTER_BITS) | counter) << REPLICA_BITS) | replicaId
+    
+    @staticmethod
+    def unpack(timestamp: int):
+        """Returns the (physical time, counter, replica id) components of the timestamp."""
+        return (timestamp >> (COUNTER_BITS + REPLICA_BITS),
+                (timestamp >> REPLICA_BITS) & ((1 << COUNTER_BITS) - 1),
+                timestamp & ((1 << REPLICA_BITS) - 1))
+    
+    """ Internal methods """
+    
+    def __increment(self):
+        self.__counter += 1
+        if self.__counter >> COUNTER_BITS:  # counter overflow: borrow the next millisecond
+            self.__physicalTime += 1
+            self.__counter = 0
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 from lowkey.collabtypes import Literals
 from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.Synchronization import synchronized
 
 from .Association import Association
 from .Clabject import Clabject
@@ -13,6 +14,10 @@ __license__ = "GPL-3.0"
 
 """
 Model type for the general logical type model level.
+
+Snapshots of the model are taken together with the snapshots of its nodes, each in constant time.
+
+In thread-safe mode, the nodes of the model are thread-safe too, including the ones added later on.
 """
 
 
@@ -23,10 +28,33 @@ class Model(Node):
         self.persistence = LWWGraph()
         self.setFeature(Literals.NODES, ())
     
+    def makeThreadSafe(self):
+        super().makeThreadSafe()
+        for node in self.getNodes():
+            node.makeThreadSafe()
+        return self
+    
+    def _memoryReport(self, seen):
+        """Reports the nodes of the model as nested structures of its persistence."""
+        report = super()._memoryReport(seen)
+        report['nodes'] = len(self.getNodes())
+        return report
+    
+    @synchronized
+    def snapshot(self):
+        snapshots = dict()
+        snapshot = super().snapshot(snapshots)
+        for node in self.getNodes():
+            node.snapshot(snapshots)
+        return snapshot
+    
     # Nodes CRUD
+    @synchronized
     def addNode(self, node:Node):
         if node in self.getNodes():
             raise Exception('Node already in the model.')
+        if self._lock is not None:
+            node.makeThreadSafe()
         nodes = self.getFeature(Literals.NODES)
         nodes = nodes + (node,)
         return self.updateFeature(Literals.NODES, nodes)
@@ -46,6 +74,7 @@ class Model(Node):
         nodes = self.getNodes()
         return [n for n in nodes if n.getType() == name]  # assumes no multi-typing
     
+    @synchronized
     def removeNode(self, node:Node):
         nodes = self.getFeature(Literals.NODES)
         remainingNodes = ()
@@ -55,6 +84,7 @@ class Model(Node):
         
         self.updateFeature(Literals.NODES, remainingNodes)
         
+    @synchronized
     def updateNode(self, oldNode:Node, newNode:Node):
         self.removeNode(oldNode)
         self.addNode(newNode)
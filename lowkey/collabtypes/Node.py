@@ -1,4 +1,6 @@
 #!/usr/bin/env python
+import copy
+import threading
 import time
 import uuid
 
@@ -15,11 +17,22 @@ __license__ = "GPL-3.0"
 Abstract Node type for the general logical type model level.
 
 Serves as a common abstraction to the other logical types.
+
+Snapshots of nodes are read-only and share the persistence of the node until it is modified.
+References to nodes captured by the same snapshot (see Model.snapshot) resolve to their snapshots.
+
+In thread-safe mode, the persistence of the node is thread-safe too.
+
+The version of the node is the version of its persistence. Nodes stored in the features of other nodes (e.g., in
+the nodes of a model) propagate their changes to the versions of those nodes (see lowkey.lww.Versioning).
 """
 
 
 class Node():
     
+    _snapshots = None  # node -> snapshot of the node, shared by the nodes of a snapshot
+    _lock = None  # reentrant lock of the writers in thread-safe mode
+    
     def __init__(self):
         super().__init__()
         self.__id = uuid.uuid1()
@@ -31,6 +44,36 @@ class Node():
     def currentTime(self):
         return self._clock.currentTime()
     
+    def getVersion(self) -> int:
+        return self.persistence.getVersion()
+    
+    def changedSince(self, version: int) -> bool:
+        """Whether the node, or any node or structure stored in its features, changed after the given version."""
+        return self.persistence.changedSince(version)
+    
+    def snapshot(self, snapshots=None):
+        snapshot = copy.copy(self)
+        snapshot.persistence = self.persistence.snapshot()
+        snapshot._snapshots = snapshots if snapshots is not None else dict()
+        snapshot._snapshots[self] = snapshot
+        return snapshot
+    
+    def isSnapshot(self):
+        return self._snapshots is not None
+    
+    def makeThreadSafe(self):
+        if self._lock is None:
+            self._lock = threading.RLock()
+            self.persistence.makeThreadSafe()
+        return self
+    
+    def isThreadSafe(self) -> bool:
+        return self._lock is not None
+    
+    def memoryReport(self):
+        """Reports the memory footprint of the persistence of the node (see LWWSet.memoryReport)."""
+        return self._memoryReport(set())
+    
     """CRDT persistence"""
 
     def getPersistence(self):
@@ -62,7 +105,7 @@ class Node():
         model.addNode(self)
     
     def getModel(self):
-        return self._model if hasattr(self, '_model') else None
+        return self._resolve(self._model) if hasattr(self, '_model') else None
         
     def changeModel(self, oldModel, newModel):
         self.removeFromModel(oldModel)
@@ -93,7 +136,8 @@ class Node():
         return self.persistence.add(name, value, self.currentTime())
     
     def getFeature(self, name):
-        return self.persistence.query(name)
+        value = self.persistence.query(name)
+        return value if self._snapshots is None else self._resolve(value)
     
     def updateFeature(self, name, value):
         self._clock.sleepOneStep()
@@ -102,3 +146,20 @@ class Node():
     def deleteFeature(self, name):
         self._clock.sleepOneStep()
         self.persistence.remove(name, self.currentTime())
+    
+    """ Internal methods """
+    
+    def _addContainer(self, container):
+        self.persistence._addContainer(container)
+    
+    def _memoryReport(self, seen):
+        seen.add(id(self))
+        return self.persistence._memoryReport(seen)
+    
+    def _resolve(self, value):
+        """Replaces the nodes in the value with their snapshots, if taken together with this one."""
+        if self._snapshots is None:
+            return value
+        if isinstance(value, tuple):
+            return tuple(self._snapshots.get(v, v) if isinstance(v, Node) else v for v in value)
+        return self._snapshots.get(value, value) if isinstance(value, Node) else value
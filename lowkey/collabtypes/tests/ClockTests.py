@@ -2,6 +2,8 @@
 import unittest
 
 from lowkey.collabtypes.Clock import Clock, ClockMode
+from lowkey.collabtypes.HybridLogicalClock import HybridLogicalClock
+from lowkey.lww.LWWMap import LWWMap
 
 __author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -27,6 +29,31 @@ class ClockTests(unittest.TestCase):
         currentTime1 = clock.currentTime()
         currentTime2 = clock.currentTime()
         self.assertEqual(abs(currentTime1-currentTime2), clock.getStep())
+    
+    def testHybridLogicalClockRequiresReplicaId(self):
+        Clock.tearDown()
+        try:
+            with self.assertRaises(Exception):
+                Clock.setUp(mode=ClockMode.HLC)
+            self.assertEqual(Clock.setUp(mode=ClockMode.HLC, replicaId=0).getMode(), ClockMode.HLC)
+        finally:
+            Clock.tearDown()
+    
+    def testMapUpdatesWithHybridLogicalClock(self):
+        Clock.tearDown()
+        try:
+            clock = Clock.setUp(mode=ClockMode.HLC, replicaId=5)
+            lwwMap = LWWMap()
+            
+            lwwMap.add("name", "Istvan", clock.currentTime())
+            timestamp = clock.currentTime()
+            lwwMap.update("name", "David", timestamp)
+            
+            self.assertEqual(lwwMap.query("name"), "David")
+            self.assertEqual([(isRemoval, HybridLogicalClock.unpack(entry[1])[2]) for isRemoval, entry in lwwMap.changesSince(timestamp - 1)],
+                             [(True, 5), (False, 5)])
+        finally:
+            Clock.tearDown()
 
 
 if __name__ == "__main__":
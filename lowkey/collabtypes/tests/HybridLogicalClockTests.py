@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+import threading
+import time
+import unittest
+
+from lowkey.collabtypes.HybridLogicalClock import HybridLogicalClock, COUNTER_BITS, PHYSICAL_BITS, REPLICA_BITS
+from lowkey.lww.LWWColumnarSet import LWWColumnarSet
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class HybridLogicalClockTests(unittest.TestCase):
+    
+    def testTimestampsAreStrictlyIncreasing(self):
+        clock = HybridLogicalClock(1)
+        
+        timestamps = [clock.now() for _ in range(10000)]
+        
+        self.assertTrue(all(earlier < later for earlier, later in zip(timestamps, timestamps[1:])))
+    
+    def testTimestampsFollowPhysicalTime(self):
+        clock = HybridLogicalClock(1)
+        before = time.time_ns() // 1000000
+        
+        physicalTime, _counter, replicaId = HybridLogicalClock.unpack(clock.now())
+        
+        self.assertGreaterEqual(physicalTime, before)
+        self.assertEqual(replicaId, 1)
+    
+    def testReplicasIssueDistinctTimestamps(self):
+        clock1 = HybridLogicalClock(1)
+        clock2 = HybridLogicalClock(2)
+        
+        timestamps1 = {clock1.now() for _ in range(1000)}
+        timestamps2 = {clock2.now() for _ in range(1000)}
+        
+        self.assertFalse(timestamps1 & timestamps2)
+    
+    def testObservedTimestampPrecedesLaterTimestamps(self):
+        clock = HybridLogicalClock(1)
+        remoteTimestamp = HybridLogicalClock.pack(time.time_ns() // 1000000 + 10 ** 6, 5, 2)  # remote clock ahead by 1000 seconds
+        
+        clock.observe(remoteTimestamp)
+        
+        self.assertGreater(clock.now(), remoteTimestamp)
+    
+    def testCounterOverflowAdvancesPhysicalTime(self):
+        clock = HybridLogicalClock(1)
+        remoteTimestamp = HybridLogicalClock.pack(time.time_ns() // 1000000 + 10 ** 6, (1 << COUNTER_BITS) - 1, 2)
+        clock.observe(remoteTimestamp)
+        
+        timestamp = clock.now()
+        
+        self.assertGreater(timestamp, remoteTimestamp)
+        self.assertEqual(HybridLogicalClock.unpack(timestamp)[1], 0)
+    
+    def testPackUnpack(self):
+        self.assertEqual(HybridLogicalClock.unpack(HybridLogicalClock.pack(123456789, 42, 7)), (123456789, 42, 7))
+    
+    def testTimestampsFitInSignedLongs(self):
+        clock = HybridLogicalClock((1 << REPLICA_BITS) - 1)
+        columnarSet = LWWColumnarSet()
+        
+        columnarSet.add("element", clock.now())
+        
+        self.assertEqual(PHYSICAL_BITS + COUNTER_BITS + REPLICA_BITS, 63)
+        self.assertLess(HybridLogicalClock.pack((1 << PHYSICAL_BITS) - 1, (1 << COUNTER_BITS) - 1, (1 << REPLICA_BITS) - 1), 1 << 63)
+        self.assertTrue(columnarSet.lookup("element"))
+    
+    def testReplicaIdIsRequired(self):
+        with self.assertRaises(Exception):
+            HybridLogicalClock(None)
+    
+    def testReplicaIdOutOfRange(self):
+        with self.assertRaises(Exception):
+            HybridLogicalClock(1 << REPLICA_BITS)
+    
+    def testConcurrentTimestampsAreUnique(self):
+        clock = HybridLogicalClock(1)
+        timestamps = []
+        
+        def issue():
+            timestamps.extend(clock.now() for _ in range(1000))
+        
+        threads = [threading.Thread(target=issue) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(set(timestamps)), 4000)
+
+
+if __name__ == "__main__":
+    unittest.main()
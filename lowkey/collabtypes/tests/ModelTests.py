@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+import threading
+import unittest
+
+from lowkey.collabtypes.Association import Association
+from lowkey.collabtypes.Clock import Clock, ClockMode
+from lowkey.collabtypes.Clabject import Clabject
+from lowkey.collabtypes.Model import Model
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class ModelTests(unittest.TestCase):
+    
+    def setUp(self):
+        Clock.setUp(ClockMode.DEBUG)
+        self._model = Model()
+    
+    def tearDown(self):
+        del(self._model)
+    
+    def testSnapshotIsIsolated(self):
+        steve = Clabject()
+        steve.setName("steve")
+        steve.addToModel(self._model)
+        
+        snapshot = self._model.snapshot()
+        steve.updateAttribute("name", "steven")
+        alice = Clabject()
+        alice.addToModel(self._model)
+        
+        self.assertEqual(len(snapshot.getNodes()), 1)
+        self.assertEqual(len(self._model.getNodes()), 2)
+        self.assertEqual(snapshot.getNodes()[0].getName(), "steve")
+        self.assertEqual(steve.getName(), "steven")
+        
+    def testSnapshotResolvesNodesToSnapshots(self):
+        steve = Clabject()
+        steve.addToModel(self._model)
+        alice = Clabject()
+        alice.addToModel(self._model)
+        colleague = Association()
+        colleague.setFrom(steve)
+        colleague.setTo(alice)
+        colleague.addToModel(self._model)
+        
+        snapshot = self._model.snapshot()
+        steveSnapshot, aliceSnapshot, colleagueSnapshot = snapshot.getNodes()
+        
+        self.assertTrue(colleagueSnapshot.isSnapshot())
+        self.assertIs(colleagueSnapshot.getFrom(), steveSnapshot)
+        self.assertIs(colleagueSnapshot.getTo(), aliceSnapshot)
+        self.assertIs(steveSnapshot.getModel(), snapshot)
+        self.assertEqual(steveSnapshot.getId(), steve.getId())
+        
+    def testSnapshotIsReadOnly(self):
+        steve = Clabject()
+        steve.addToModel(self._model)
+        
+        snapshot = self._model.snapshot()
+        
+        self.assertRaises(Exception, snapshot.addNode, Clabject())
+        self.assertRaises(Exception, snapshot.getNodes()[0].setName, "steve")
+
+        
+    def testThreadSafeModel(self):
+        steve = Clabject()
+        steve.addToModel(self._model)
+        
+        self._model.makeThreadSafe()
+        alice = Clabject()
+        alice.addToModel(self._model)
+        
+        self.assertTrue(self._model.isThreadSafe())
+        self.assertTrue(self._model.getPersistence().isThreadSafe())
+        self.assertTrue(steve.isThreadSafe())
+        self.assertTrue(alice.getPersistence().isThreadSafe())
+        
+    def testConcurrentNodeAdditions(self):
+        self._model.makeThreadSafe()
+        
+        def addNodes():
+            for _ in range(20):
+                Clabject().addToModel(self._model)
+        
+        threads = [threading.Thread(target=addNodes) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(self._model.getNodes()), 80)
+
+        
+    def testMemoryReport(self):
+        steve = Clabject()
+        steve.setName("steve")
+        steve.addToModel(self._model)
+        
+        report = self._model.memoryReport()
+        
+        self.assertEqual(report['nodes'], 1)
+        self.assertEqual(report['nested']['objects'], 1)
+        self.assertEqual(report['nested']['bytes'], steve.memoryReport()['bytes'])
+        
+    def testNodeChangeChangesModel(self):
+        steve = Clabject()
+        steve.setName("steve")
+        steve.addToModel(self._model)
+        version = self._model.getVersion()
+        self.assertFalse(self._model.changedSince(version))
+        
+        steve.updateAttribute("name", "steven")
+        
+        self.assertTrue(self._model.changedSince(version))
+
+
+if __name__ == "__main__":
+    unittest.main()
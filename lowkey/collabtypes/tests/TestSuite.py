@@ -4,6 +4,8 @@ import unittest
 from lowkey.collabtypes.tests.ClockTests import ClockTests
 from lowkey.collabtypes.tests.ClabjectTests import ClabjectTests
 from lowkey.collabtypes.tests.EntityTests import EntityTests
+from lowkey.collabtypes.tests.HybridLogicalClockTests import HybridLogicalClockTests
+from lowkey.collabtypes.tests.ModelTests import ModelTests
 
 __author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -16,7 +18,7 @@ Full test suite for the modeling layer.
 
 
 def create_suite():
-    testCases = [ClabjectTests, EntityTests, ClockTests]
+    testCases = [ClabjectTests, EntityTests, ModelTests, ClockTests, HybridLogicalClockTests]
     loadedCases = []
     
     for case in testCases:
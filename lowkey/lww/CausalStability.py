@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Compaction policy for the LWW types, based on causal stability.
+
+Every replica acknowledges a timestamp once it has received every operation up to that timestamp and
+will not issue older operations anymore. The minimum of the acknowledged timestamps is the stability
+watermark: operations older than the watermark are known by every replica, so the entries they
+dominate and the tombstones older than the watermark can be dropped by calling compact(watermark)
+on the LWW types.
+"""
+
+
+class CausalStability():
+    
+    def __init__(self):
+        self._acknowledged = dict()  # replica id -> latest timestamp acknowledged by the replica
+    
+    def acknowledge(self, replicaId, timestamp: int):
+        if timestamp < self._acknowledged.get(replicaId, timestamp):  # acknowledgements never move backwards
+            return
+        self._acknowledged[replicaId] = timestamp
+    
+    def removeReplica(self, replicaId):
+        self._acknowledged.pop(replicaId, None)
+    
+    def getWatermark(self):
+        if not self._acknowledged:
+            return None
+        return min(self._acknowledged.values())
+    
+    def compact(self, *lwwObjects):
+        watermark = self.getWatermark()
+        if watermark is None:
+            return
+        
+        for lwwObject in lwwObjects:
+            lwwObject.compact(watermark)
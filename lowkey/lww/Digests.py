@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+import hashlib
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Bucketed digests of the state of the data types, for comparing replicas without shipping their state.
+
+The keys of a structure are distributed into a fixed number of buckets by their hashes. The digest of a bucket
+is the XOR of the digests of its existing keys, each hashing the entry that makes the key exist, so that the digest
+of a bucket is updated in constant time by every change of the key. The root digest hashes the digests of the
+buckets and the range tombstone.
+
+Digests cover the observable state only, which compaction does not change: tombstones and dominated add entries
+are not hashed, so that replicas compacted at different watermarks still have equal digests. Replicas of equal
+digests may hold different tombstones, which matters only for operations older than those tombstones; such
+operations are delivered by the deltas of the replicas, as for compaction (see LWWSet.compact).
+
+Replicas compare their root digests first, then their bucket digests, and exchange the delta of the differing
+buckets only. Hashes are stable across processes: structures stored in the values are hashed by their ids,
+which are shared by their replicas, and other values by their repr. The same stable encoding breaks the ties
+between writes of equal timestamps, so that every replica picks the same winner regardless of the order of arrival.
+"""
+
+BUCKETS = 256
+DIGEST_SIZE = 8
+
+
+def stableHash(value) -> int:
+    return int.from_bytes(hashlib.blake2b(_encode(value).encode(), digest_size=DIGEST_SIZE).digest(), 'big')
+
+
+def bucketOf(key) -> int:
+    return stableHash(key) % BUCKETS
+
+
+def keyDigest(key, existingEntry) -> int:
+    """Digest of the state of a key: 0 if the key does not exist."""
+    if existingEntry is None:
+        return 0
+    return stableHash((key, existingEntry))
+
+
+def rootDigest(bucketDigests, clearedBefore) -> int:
+    encoding = b''.join(digest.to_bytes(DIGEST_SIZE, 'big') for digest in bucketDigests) + repr(clearedBefore).encode()
+    return int.from_bytes(hashlib.blake2b(encoding, digest_size=DIGEST_SIZE).digest(), 'big')
+
+
+def precedes(timestamp, value, otherTimestamp, otherValue) -> bool:
+    """
+    Whether a write of the value at the timestamp loses against a write of the other value at the other timestamp.
+    Writes of equal timestamps are ordered by the stable encodings of their values.
+    """
+    if timestamp != otherTimestamp:
+        return timestamp < otherTimestamp
+    return _encode(value) < _encode(otherValue)
+
+
+def differingBuckets(bucketDigests, otherBucketDigests):
+    return [bucket for bucket, (digest, otherDigest) in enumerate(zip(bucketDigests, otherBucketDigests)) if digest != otherDigest]
+
+
+def _encode(value) -> str:
+    if isinstance(value, tuple):
+        return '(' + ','.join(_encode(element) for element in value) + ')'
+    if hasattr(value, 'getId'):
+        return '<' + type(value).__name__ + ' ' + str(value.getId()) + '>'
+    return repr(value)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Persistent hash array mapped trie (HAMT).
+
+Immutable map from hashable keys to values. Writes return a new trie in O(log n), which shares every
+node not on the path of the written key with the original one. Tries are freed by the garbage collector
+once they are no longer referenced.
+
+Every level of the trie consumes 5 bits of the 64-bit hash of the keys. The entries of a node are either
+(key, value) leaves or child nodes. Keys with identical hashes end up in a collision node.
+"""
+
+BITS = 5
+MASK = (1 << BITS) - 1
+MAX_SHIFT = 60  # shift of the last level consuming hash bits
+HASH_MASK = (1 << 64) - 1
+
+
+def _hash(key):
+    return hash(key) & HASH_MASK
+
+
+def _popcount(bitmap):
+    return bin(bitmap).count("1")
+
+
+class _BitmapNode():
+    
+    __slots__ = ('bitmap', 'entries')
+    
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+    
+    def replace(self, position, entry):
+        return _BitmapNode(self.bitmap, self.entries[:position] + (entry,) + self.entries[position + 1:])
+
+
+class _CollisionNode():
+    
+    __slots__ = ('entries',)
+    
+    def __init__(self, entries):
+        self.entries = entries
+
+
+EMPTY = _BitmapNode(0, ())
+
+
+class HAMT():
+    
+    __slots__ = ('_root', '_size')
+    
+    def __init__(self, root=EMPTY, size=0):
+        self._root = root
+        self._size = size
+    
+    def __len__(self):
+        return self._size
+    
+    def __contains__(self, key):
+        return self._find(key) is not None
+    
+    def __iter__(self):
+        """Yields the (key, value) tuples of the trie."""
+        yield from self._leaves(self._root)
+    
+    """Interface methods"""
+    
+    def get(self, key, default=None):
+        leaf = self._find(key)
+        return leaf[1] if leaf is not None else default
+    
+    def set(self, key, value):
+        root, added = self._set(self._root, _hash(key), 0, (key, value))
+        return self if root is self._root else HAMT(root, self._size + added)
+    
+    def delete(self, key):
+        root, removed = self._delete(self._root, _hash(key), 0, key)
+        if not removed:
+            return self
+        return HAMT(EMPTY if root is None else root, self._size - 1)
+    
+    """ Internal methods """
+    
+    def _find(self, key):
+        node = self._root
+        keyHash = _hash(key)
+        shift = 0
+        while True:
+            if isinstance(node, _CollisionNode):
+                return next((leaf for leaf in node.entries if leaf[0] == key), None)
+            
+            bit = 1 << ((keyHash >> shift) & MASK)
+            if not node.bitmap & bit:
+                return None
+            entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+            if isinstance(entry, tuple):
+                return entry if entry[0] == key else None
+            node = entry
+            shift += BITS
+    
+    def _leaves(self, node):
+        for entry in node.entries:
+            if isinstance(entry, tuple):
+                yield entry
+            else:
+                yield from self._leaves(entry)
+    
+    def _set(self, node, keyHash, shift, leaf):
+        """Returns the node with the leaf set, and whether the key is new."""
+        if isinstance(node, _CollisionNode):
+            for position, entry in enumerate(node.entries):
+                if entry[0] == leaf[0]:
+                    if entry[1] is leaf[1]:
+                        return node, False
+                    return _CollisionNode(node.entries[:position] + (leaf,) + node.entries[position + 1:]), False
+            return _CollisionNode(node.entries + (leaf,)), True
+        
+        bit = 1 << ((keyHash >> shift) & MASK)
+        position = _popcount(node.bitmap & (bit - 1))
+        if not node.bitmap & bit:
+            return _BitmapNode(node.bitmap | bit, node.entries[:position] + (leaf,) + node.entries[position:]), True
+        
+        entry = node.entries[position]
+        if isinstance(entry, tuple):
+            if entry[0] == leaf[0]:
+                if entry[1] is leaf[1]:
+                    return node, False
+                return node.replace(position, leaf), False
+            return node.replace(position, self._split(entry, _hash(entry[0]), leaf, keyHash, shift + BITS)), True
+        
+        child, added = self._set(entry, keyHash, shift + BITS, leaf)
+        return (node, False) if child is entry else (node.replace(position, child), added)
+    
+    def _split(self, leaf1, hash1, leaf2, hash2, shift):
+        """Returns the node holding two leaves that share a slot on the previous level."""
+        if shift > MAX_SHIFT:
+            return _CollisionNode((leaf1, leaf2))
+        
+        index1 = (hash1 >> shift) & MASK
+        index2 = (hash2 >> shift) & MASK
+        if index1 == index2:
+            return _BitmapNode(1 << index1, (self._split(leaf1, hash1, leaf2, hash2, shift + BITS),))
+        return _BitmapNode((1 << index1) | (1 << index2), (leaf1, leaf2) if index1 < index2 else (leaf2, leaf1))
+    
+    def _delete(self, node, keyHash, shift, key):
+        """Returns the node without the key (a single remaining leaf, or None if empty), and whether the key was found."""
+        if isinstance(node, _CollisionNode):
+            entries = tuple(entry for entry in node.entries if entry[0] != key)
+            if len(entries) == len(node.entries):
+                return node, False
+            return (entries[0] if len(entries) == 1 else _CollisionNode(entries)), True
+        
+        bit = 1 << ((keyHash >> shift) & MASK)
+        if not node.bitmap & bit:
+            return node, False
+        position = _popcount(node.bitmap & (bit - 1))
+        entry = node.entries[position]
+        
+        if isinstance(entry, tuple):
+            if entry[0] != key:
+                return node, False
+            child = None
+        else:
+            child, removed = self._delete(entry, keyHash, shift + BITS, key)
+            if not removed:
+                return node, False
+            if isinstance(child, _BitmapNode) and len(child.entries) == 1 and isinstance(child.entries[0], tuple):
+                child = child.entries[0]  # lift the single remaining leaf
+        
+        if child is not None:
+            return node.replace(position, child), True
+        if len(node.entries) == 1:
+            return None, True
+        return _BitmapNode(node.bitmap ^ bit, node.entries[:position] + node.entries[position + 1:]), True
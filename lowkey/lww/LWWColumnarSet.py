@@ -0,0 +1,368 @@
+#!/usr/bin/env python
+from array import array
+import bisect
+import collections
+import copy
+import itertools
+import operator
+import uuid
+
+from lowkey.lww.Versioning import addContainer, notifyContainers
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Columnar LWWSet data type for large sets of primitive values (e.g., ints and strings).
+
+Provides the interface of the LWWSet type, but instead of storing (value, timestamp) tuples, every
+value is assigned an integer id (its position in the insertion order) and only the latest add and remove
+timestamps of the values are stored, in signed 64-bit arrays indexed by the ids. Entries dominated by a later
+add or remove of the same value are not retained. Timestamps must fit in 64 bits.
+
+The value exists iff its latest add timestamp is not smaller than its latest remove timestamp, and than
+the range tombstone raised by clearing the set.
+
+Bulk operations on the columns (counting, merging, deltas) run over the arrays with the built-in map and
+itertools functions, so that the per-value work is done in C. A merge is a single change of the set.
+Clearing the set does not recount its values: the size is recounted on demand, unless every value is cleared.
+
+Values are mapped to their ids by a dictionary, unless every value is a signed 64-bit int: then the values are
+stored in a column in the order of their ids, and sorted into a column of values and a column of their ids, looked
+up by bisection, so that neither the values nor their ids are Python objects. Only the values added since the last
+sorting are kept in the dictionary, until they outgrow a fraction of the sorted values. The first value of another
+type moves every value into the dictionary, which then dominates the memory footprint.
+
+Snapshots share the arrays with the set until it is modified (copy-on-write).
+
+Changes of the set increment the versions of the structures containing it (see Versioning).
+"""
+
+NONE = -2 ** 63  # timestamp of operations that never happened
+MAX_INT64 = 2 ** 63 - 1
+UNSORTED_LIMIT = 1024  # number of int values kept in the dictionary at least...
+UNSORTED_RATIO = 8  # ...or the fraction of the sorted values, before they are sorted into the columns
+
+
+class LWWColumnarSet():
+    
+    def __init__(self):
+        self._ids = dict()  # value -> id, in the order of the ids, of the values not in the sorted columns
+        self._values = array('q')  # id -> value, while every value is a 64-bit int; None afterwards
+        self._sortedValues = array('q')  # int values in ascending order...
+        self._sortedIds = array('q')  # ...and their ids
+        self._addTimestamps = array('q')  # id -> latest add timestamp
+        self._removeTimestamps = array('q')  # id -> latest remove timestamp
+        self._versions = array('q')  # id -> local version of the latest change
+        self._clearedBefore = NONE
+        self._clearedVersion = 0
+        self._size = 0  # None if to be recounted
+        self._latestAddTimestamp = NONE
+        self._version = 0
+        self._readOnly = False
+        self._shared = False  # whether the arrays are shared with snapshots
+        self._containers = None  # structures containing this set (see Versioning.addContainer)
+        self._id = uuid.uuid1()
+    
+    def __iter__(self):
+        existing = map(operator.ge, self._addTimestamps, self._removedBefore(self._removeTimestamps))
+        for value, addTimestamp in itertools.compress(zip(self._valueColumn(), self._addTimestamps), existing):
+            yield (value, addTimestamp)
+    
+    """Interface methods"""
+    
+    def getId(self):
+        return self._id
+    
+    def getVersion(self) -> int:
+        return self._version
+    
+    def changedSince(self, version: int) -> bool:
+        return self._version > version
+    
+    def lookup(self, value) -> bool:
+        i = self._ids.get(value)
+        if i is None and self._sortedValues:
+            i = self._sortedIdOf(value)
+        return i is not None and self._exists(i)
+    
+    def add(self, newValue, timestamp: int) -> bool:
+        self._beforeWrite()
+        i = self._idOf(newValue)
+        if timestamp < self._addTimestamps[i]:  # LWW
+            return False
+        
+        self._update(i, timestamp, self._removeTimestamps[i])
+        return True
+    
+    def remove(self, value, timestamp: int):
+        self._beforeWrite()
+        i = self._idOf(value)
+        if timestamp < self._removeTimestamps[i]:  # LWW
+            return False
+        
+        self._update(i, self._addTimestamps[i], timestamp)
+        return True
+    
+    def addAll(self, values, timestamps):
+        for value, timestamp in self._latestTimestamps(values, timestamps).items():
+            self.add(value, timestamp)
+    
+    def removeAll(self, values, timestamps):
+        for value, timestamp in self._latestTimestamps(values, timestamps).items():
+            self.remove(value, timestamp)
+    
+    def clear(self, timestamp: int):
+        self._beforeWrite()
+        if not timestamp > self._clearedBefore:  # LWW
+            return
+        
+        self._clearedBefore = timestamp
+        self._nextVersion()
+        self._clearedVersion = self._version
+        self._size = 0 if self._latestAddTimestamp < timestamp else None
+    
+    def size(self) -> int:
+        if self._size is None:
+            self._size = self._count(self._addTimestamps, self._removeTimestamps)
+        return self._size
+    
+    def merge(self, other):
+        """State-based merge with another LWWColumnarSet, or with any LWW set providing deltas."""
+        if not isinstance(other, LWWColumnarSet):
+            self.applyDelta(other.deltaSince(0))
+            return
+        
+        self.clear(other._clearedBefore)
+        self._beforeWrite()
+        otherValues = other._valueColumn()
+        ids = self._idsOf(otherValues)
+        if None in ids:
+            self._intern([value for value, i in zip(otherValues, ids) if i is None])
+            ids = self._idsOf(otherValues)
+        
+        addTimestamps = list(map(self._addTimestamps.__getitem__, ids))
+        removeTimestamps = list(map(self._removeTimestamps.__getitem__, ids))
+        changed = list(map(operator.or_, map(operator.gt, other._addTimestamps, addTimestamps),
+                           map(operator.gt, other._removeTimestamps, removeTimestamps)))
+        if not any(changed):
+            return
+        
+        ids = list(itertools.compress(ids, changed))
+        addTimestamps = list(itertools.compress(addTimestamps, changed))
+        removeTimestamps = list(itertools.compress(removeTimestamps, changed))
+        mergedAdds = list(map(max, itertools.compress(other._addTimestamps, changed), addTimestamps))
+        mergedRemoves = list(map(max, itertools.compress(other._removeTimestamps, changed), removeTimestamps))
+        if self._size is not None:
+            self._size += self._count(mergedAdds, mergedRemoves) - self._count(addTimestamps, removeTimestamps)
+        self._latestAddTimestamp = max(self._latestAddTimestamp, max(mergedAdds))
+        
+        self._nextVersion()  # the merge is a single change
+        self._scatter(self._addTimestamps, ids, mergedAdds)
+        self._scatter(self._removeTimestamps, ids, mergedRemoves)
+        self._scatter(self._versions, ids, itertools.repeat(self._version))
+    
+    def deltaSince(self, version: int):
+        """Returns the (add entries, remove entries, range tombstone) delta of the values changed after the given local version."""
+        adds = []
+        removes = []
+        changed = list(map(operator.lt, itertools.repeat(version), self._versions))
+        columns = zip(self._valueColumn(), self._addTimestamps, self._removeTimestamps)
+        for value, addTimestamp, removeTimestamp in itertools.compress(columns, changed):
+            if addTimestamp != NONE:
+                adds.append((value, addTimestamp))
+            if removeTimestamp != NONE:
+                removes.append((value, removeTimestamp))
+        
+        clearedBefore = self._clearedBefore if self._clearedVersion > version else None
+        return (tuple(adds), tuple(removes), clearedBefore)
+    
+    def applyDelta(self, delta):
+        adds, removes, clearedBefore = delta
+        for value, timestamp in adds:
+            self.add(value, timestamp)
+        for value, timestamp in removes:
+            self.remove(value, timestamp)
+        if clearedBefore is not None:
+            self.clear(clearedBefore)
+    
+    def snapshot(self):
+        """Returns a read-only snapshot of the set in constant time."""
+        if self._readOnly:
+            return self
+        
+        snapshot = copy.copy(self)
+        snapshot._readOnly = True
+        snapshot._containers = None
+        self._shared = True
+        return snapshot
+    
+    def compact(self, watermark: int):
+        """Drops the values whose removal is older than the watermark or that are cleared, and renumbers the remaining ones."""
+        self._beforeWrite()
+        compacted = LWWColumnarSet()
+        values = []
+        columns = zip(self._valueColumn(), self._addTimestamps, self._removeTimestamps, self._versions)
+        for value, addTimestamp, removeTimestamp, version in columns:
+            if addTimestamp < self._clearedBefore and not removeTimestamp > self._clearedBefore:
+                continue
+            if removeTimestamp != NONE and removeTimestamp < watermark:
+                if addTimestamp < removeTimestamp:
+                    continue
+                removeTimestamp = NONE
+            
+            values.append(value)
+            compacted._addTimestamps.append(addTimestamp)
+            compacted._removeTimestamps.append(removeTimestamp)
+            compacted._versions.append(version)
+        
+        if self._values is None:
+            compacted._values = None
+        compacted._assignIds(values)
+        self._ids = compacted._ids
+        self._values = compacted._values
+        self._sortedValues = compacted._sortedValues
+        self._sortedIds = compacted._sortedIds
+        self._addTimestamps = compacted._addTimestamps
+        self._removeTimestamps = compacted._removeTimestamps
+        self._versions = compacted._versions
+    
+    """ Internal methods """
+    
+    def _beforeWrite(self):
+        if self._readOnly:
+            raise Exception("Snapshots are read-only.")
+        
+        if self._shared:  # the sorted columns are replaced rather than written
+            self._ids = dict(self._ids)
+            if self._values is not None:
+                self._values = array('q', self._values)
+            self._addTimestamps = array('q', self._addTimestamps)
+            self._removeTimestamps = array('q', self._removeTimestamps)
+            self._versions = array('q', self._versions)
+            self._shared = False
+    
+    def _idOf(self, value):
+        """Returns the id of the value, assigning a new id to a new value."""
+        i = self._ids.get(value)
+        if i is None and self._sortedValues:
+            i = self._sortedIdOf(value)
+        if i is None:
+            i = len(self._addTimestamps)
+            if self._values is None:
+                self._ids[value] = i
+            elif type(value) is int and NONE <= value <= MAX_INT64:
+                self._values.append(value)
+                self._ids[value] = i
+                if len(self._ids) > UNSORTED_LIMIT and len(self._ids) > len(self._sortedValues) // UNSORTED_RATIO:
+                    self._sortIds()
+            else:
+                self._assignIds((value,))
+            self._addTimestamps.append(NONE)
+            self._removeTimestamps.append(NONE)
+            self._versions.append(0)
+        return i
+    
+    def _idsOf(self, values):
+        """Returns the ids of the values, None for the values without ids."""
+        ids = list(map(self._ids.get, values))
+        if self._sortedValues and None in ids:
+            ids = [self._sortedIdOf(value) if i is None else i for value, i in zip(values, ids)]
+        return ids
+    
+    def _sortedIdOf(self, value):
+        sortedValues = self._sortedValues
+        try:
+            j = bisect.bisect_left(sortedValues, value)
+        except TypeError:  # not a number, thus not an int value
+            return None
+        if j < len(sortedValues) and sortedValues[j] == value:
+            return self._sortedIds[j]
+        return None
+    
+    def _assignIds(self, values):
+        """Assigns the next ids to new values, moving every value into the dictionary at the first value that is not a 64-bit int."""
+        first = len(self._values) if self._values is not None else len(self._ids)
+        if self._values is not None:
+            if all(type(value) is int and NONE <= value <= MAX_INT64 for value in values):
+                self._values.extend(values)
+            else:
+                self._ids = dict(zip(self._values, itertools.count()))
+                self._values = None
+                self._sortedValues = array('q')
+                self._sortedIds = array('q')
+        self._ids.update(zip(values, itertools.count(first)))
+        if self._values is not None and len(self._ids) > max(UNSORTED_LIMIT, len(self._sortedValues) // UNSORTED_RATIO):
+            self._sortIds()
+    
+    def _sortIds(self):
+        """Moves the int values of the dictionary into the sorted columns, copying the runs of sorted values between them."""
+        sortedValues, sortedIds = self._sortedValues, self._sortedIds
+        values, ids = array('q'), array('q')
+        start = 0
+        for value, i in sorted(self._ids.items()):
+            end = bisect.bisect_left(sortedValues, value, start)
+            values += sortedValues[start:end]
+            ids += sortedIds[start:end]
+            values.append(value)
+            ids.append(i)
+            start = end
+        values += sortedValues[start:]
+        ids += sortedIds[start:]
+        self._sortedValues, self._sortedIds = values, ids
+        self._ids = dict()
+    
+    def _valueColumn(self):
+        """Returns the values in the order of their ids."""
+        return self._values if self._values is not None else self._ids
+    
+    def _latestTimestamps(self, values, timestamps):
+        latest = dict()
+        for value, timestamp in zip(values, itertools.repeat(timestamps) if isinstance(timestamps, int) else timestamps):
+            if timestamp > latest.get(value, NONE):
+                latest[value] = timestamp
+        return latest
+    
+    def _intern(self, values):
+        """Assigns ids to new values in bulk."""
+        self._assignIds(values)
+        added = len(values)
+        self._addTimestamps.extend(itertools.repeat(NONE, added))
+        self._removeTimestamps.extend(itertools.repeat(NONE, added))
+        self._versions.extend(itertools.repeat(0, added))
+    
+    def _scatter(self, column, ids, values):
+        collections.deque(map(column.__setitem__, ids, values), maxlen=0)  # consumes the map in C
+    
+    def _count(self, addTimestamps, removeTimestamps):
+        """Number of existing values, given their add and remove timestamps."""
+        return sum(map(operator.ge, addTimestamps, self._removedBefore(removeTimestamps)))
+    
+    def _removedBefore(self, removeTimestamps):
+        """Streams the timestamps before which the values are removed; NONE + 1 excludes the values never added."""
+        return map(max, removeTimestamps, itertools.repeat(max(self._clearedBefore, NONE + 1)))
+    
+    def _exists(self, i) -> bool:
+        addTimestamp = self._addTimestamps[i]
+        return addTimestamp != NONE and not addTimestamp < self._removeTimestamps[i] and not addTimestamp < self._clearedBefore
+    
+    def _update(self, i, addTimestamp, removeTimestamp):
+        existed = self._exists(i)
+        self._addTimestamps[i] = addTimestamp
+        self._removeTimestamps[i] = removeTimestamp
+        if self._size is not None:
+            self._size += self._exists(i) - existed
+        if addTimestamp > self._latestAddTimestamp:
+            self._latestAddTimestamp = addTimestamp
+        self._nextVersion()
+        self._versions[i] = self._version
+    
+    def _nextVersion(self):
+        self._version += 1
+        if self._containers:
+            notifyContainers(self._containers, {id(self)})
+    
+    def _addContainer(self, container):
+        self._containers = addContainer(self._containers, container)
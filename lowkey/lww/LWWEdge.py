@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.Versioning import containersOf, registerNested
 
 __author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -8,10 +9,45 @@ __license__ = "GPL-3.0"
 
 """
 LWWEdge for representing edges in LWWGraphs.
+
+The graphs index their edges by the name and the endpoints of the edges. Edges let the graphs containing them
+re-index them whenever their name or endpoints change.
 """
 
+INDEXED_KEYS = ("name", "from", "to")
+
 
 class LWWEdge(LWWMap):
 
     def __init__(self):
         super().__init__()
+    
+    def clear(self, timestamp: int):
+        super().clear(timestamp)
+        self.__indexedKeysChanged()
+    
+    """Internal methods"""
+    
+    @classmethod
+    def _ofEndpoints(cls, name, source, destination):
+        """Returns a new edge of the name and endpoints, built in its loaded state rather than by adding them one by one."""
+        edge = cls()
+        entries = ((("name", name), 0), (("from", source), 0), (("to", destination), 0))
+        edge._addSet = dict(zip(entries, (1, 2, 3)))
+        edge._addIndex = {"name": entries[0], "from": entries[1], "to": entries[2]}
+        edge._existingView = edge._addIndex.copy()
+        edge._latestAddTimestamp = 0
+        edge._version = 3
+        registerNested((name, source, destination), edge)
+        return edge
+    
+    def _refreshView(self, key):
+        super()._refreshView(key)
+        if key in INDEXED_KEYS:
+            self.__indexedKeysChanged()
+    
+    def __indexedKeysChanged(self):
+        if self._containers:
+            for container in containersOf(self._containers):
+                if hasattr(container, '_edgeChanged'):
+                    container._edgeChanged(self)
@@ -1,8 +1,15 @@
 #!/usr/bin/env python
+from collections import deque
+import heapq
+import itertools
+import sys
+
+from lowkey.lww.Digests import differingBuckets, rootDigest
 from lowkey.lww.LWWEdge import LWWEdge
 from lowkey.lww.LWWMap import LWWMap
 from lowkey.lww.LWWSet import LWWSet
 from lowkey.lww.LWWVertex import LWWVertex
+from lowkey.lww.Synchronization import synchronized
 
 _author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -12,6 +19,18 @@ __license__ = "GPL-3.0"
 """
 LWWGraph data type, based on the 2P2PGraph specification in
 https://hal.inria.fr/file/index/docid/555588/filename/techreport.pdf.
+
+The existing edges are indexed by their names and by their source and destination vertices, so that
+edge lookups take constant time and neighbourhood queries are proportional to the degree of the vertex.
+Edges of the same name added by different replicas are all indexed under that name.
+
+The traversals are generators running over the adjacency indexes in O(V+E), and can be terminated early.
+The graph must not be modified while traversing it, except in thread-safe mode, in which traversals run over
+a snapshot of the graph, and the adjacency lists and edge lookups are collected holding the lock. The vertex and edge sets of the graph share the lock of the graph.
+Snapshots view the edge indexes too: later writes copy the edges of the written index keys only.
+
+The bucket digests, the differing buckets and the deltas of buckets of the graph are (graph as a map, vertices,
+edges) triples, like the deltas of the graph.
 """
 
 
@@ -21,29 +40,44 @@ class LWWGraph(LWWMap):
         super().__init__()
         self.__vertices = LWWSet()  # set of (LWWVertex, timestamp) tuples
         self.__edges = LWWSet()  # set of (LWWEdge, timestamp) tuples        
+        self.__vertices._versionSource = self  # changes of the graph are stamped by a single version counter
+        self.__edges._versionSource = self
+        self.__outEdges = dict()  # vertex -> existing edges leaving the vertex (see __edgesOf)
+        self.__inEdges = dict()  # vertex -> existing edges entering the vertex
+        self.__edgesByName = dict()  # edge name -> existing edges with the name
+        self.__indexedEdges = dict()  # indexed edge -> (name, source, destination)
     
     """Interface methods: accessors"""
         
     def numberOfVertices(self):
         return self.__vertices.size()
     
+    def makeThreadSafe(self):
+        super().makeThreadSafe()
+        self.__vertices._lock = self._lock
+        self.__edges._lock = self._lock
+        return self
+    
     """Interface methods: vertices"""
 
     def vertexExists(self, vertex:LWWVertex) -> bool:
         return self.__vertices.lookup(vertex)
     
+    @synchronized
     def getAdjacencyListForVertex(self, vertex:LWWVertex):
-        adjacentVertices = []
-        for edge, _timestamp in self.__edges:
-            if edge.query("from") == vertex:
-                adjacentVertices.append(edge.query("to"))
-        return adjacentVertices
+        return list(self.__successors(vertex))
     
+    @synchronized
+    def getIncomingAdjacencyListForVertex(self, vertex:LWWVertex):
+        return list(self.__predecessors(vertex))
+    
+    @synchronized
     def addVertex(self, vertex:LWWVertex, timestamp: int):
         return self.__vertices.add(vertex, timestamp)
     
     """Precedence is given to this operation, as discussed in the specification."""
 
+    @synchronized
     def removeVertex(self, vertex:LWWVertex, timestamp: int):
         if self.__vertexIsSourceOfEdge(vertex) or self.__vertexIsDestinationOfEdge(vertex):
             raise Exception
@@ -51,28 +85,25 @@ class LWWGraph(LWWMap):
             self.__vertices.remove(vertex, timestamp) 
     
     def __vertexIsSourceOfEdge(self, vertex:LWWVertex):
-        for edge, _timestamp in self.__edges:
-            if edge.query("from") == vertex:
-                return True
-        return False
+        return vertex in self.__outEdges
     
     def __vertexIsDestinationOfEdge(self, vertex:LWWVertex):
-        for edge, _timestamp in self.__edges:
-            if edge.query("to") == vertex:
-                return True
-        return False
+        return vertex in self.__inEdges
     
     """Interface methods: edges"""
     
+    @synchronized
     def edgeExists(self, edge) -> bool:
         return True if self.__queryEdgeByName(edge.query("name")) else False
     
+    @synchronized
     def edgeExistsWithName(self, edgeName) -> bool:
         return True if self.__queryEdgeByName(edgeName) else False
    
     def nodeExists(self, node):
         return self.vertexExists(node) or node == self
      
+    @synchronized
     def addEdgeWithName(self, edgeName, sourceNode, destinationNode, timestamp: int):
         if not self.nodeExists(sourceNode):
             raise KeyError("Source vertex does not exist.")
@@ -85,7 +116,9 @@ class LWWGraph(LWWMap):
         edge.add("to", destinationNode)
         
         self.__edges.add(edge, timestamp)
+        self.__indexEdge(edge)
         
+    @synchronized
     def addEdge(self, edge:LWWEdge, timestamp: int):
         if not self.nodeExists(edge.query("from")):
             raise KeyError("Source vertex does not exist.")
@@ -93,24 +126,339 @@ class LWWGraph(LWWMap):
             raise KeyError("Destination vertex does not exist.")
         
         self.__edges.add(edge, timestamp)
+        self.__indexEdge(edge)
     
+    @synchronized
     def removeEdgeByName(self, edgeName, timestamp: int):
         edge = self.__queryEdgeByName(edgeName)
         if not edge:
             raise Exception("Edge does not exist")
         
-        self.removeEdge(edge, timestamp)
+        self.__removeEdge(edge, timestamp)
     
+    @synchronized
     def removeEdge(self, edge, timestamp):
         if not self.__queryEdgeByName(edge.query("name")):
             raise Exception("Edge does not exist")
-        self.__edges.remove(edge, timestamp)
+        self.__removeEdge(edge, timestamp)
+    
+    """Bulk import and export"""
+    
+    @synchronized
+    def importGraph(self, vertices, edges, timestamps, edgeTimestamps=None):
+        """
+        Adds the vertices and the (name, source, destination) edges in bulk. The timestamps are single timestamps,
+        or columns with one timestamp per vertex and per edge. Unless given, the edges get the timestamp of the vertices,
+        which must be a single timestamp then. Columns of other lengths than their vertices or edges are rejected.
+        Every endpoint is validated before adding anything, against the existing vertices and the imported vertices
+        their adds make exist, and the edges are indexed in one pass. The import allocates many small structures;
+        callers importing very large graphs may pause the garbage collector (gc.disable) around it themselves.
+        """
+        vertices = list(vertices)
+        edges = list(edges)
+        if edgeTimestamps is None:
+            if not isinstance(timestamps, int) and edges:
+                raise Exception("Edge timestamps are required with a column of vertex timestamps.")
+            edgeTimestamps = timestamps
+        timestamps = self.__timestampColumn(timestamps, len(vertices), "vertices")
+        edgeTimestamps = self.__timestampColumn(edgeTimestamps, len(edges), "edges")
+        
+        vertexEntries = self.__vertices._latestEntries(zip(vertices, timestamps))
+        importedVertices = self.__vertices._existingAfterAdding(vertexEntries)
+        existingVertices = self.__vertices._existingView
+        
+        for _name, source, destination in edges:
+            if source not in importedVertices and source not in existingVertices and source != self:
+                raise KeyError("Source vertex does not exist.")
+            if destination not in importedVertices and destination not in existingVertices and destination != self:
+                raise KeyError("Destination vertex does not exist.")
+        
+        self.__vertices._addEntries(vertexEntries)
+        lwwEdges = [LWWEdge._ofEndpoints(name, source, destination) for name, source, destination in edges]
+        self.__edges.addAll(lwwEdges, edgeTimestamps)
+        
+        existingEdges = self.__edges._existingView
+        for edge, (name, source, destination) in zip(lwwEdges, edges):
+            if edge in existingEdges:
+                self.__index(edge, name, source, destination)
+    
+    def exportVertices(self):
+        """Streams the (vertex, timestamp) tuples of the existing vertices."""
+        yield from self._readable().__vertices
+    
+    def exportEdges(self):
+        """Streams the (name, source, destination, timestamp) tuples of the existing edges."""
+        graph = self._readable()
+        for edge, timestamp in graph.__edges:
+            name, source, destination = graph.__indexedEdges[edge]
+            yield (name, source, destination, timestamp)
+    
+    """Traversal"""
+    
+    def breadthFirstSearch(self, start):
+        """Yields the vertices reachable from the start vertex, including itself, in breadth-first order."""
+        graph = self._readable()
+        visited = {start}
+        queue = deque([start])
+        while queue:
+            vertex = queue.popleft()
+            yield vertex
+            for successor in graph.__successors(vertex):
+                if successor not in visited:
+                    visited.add(successor)
+                    queue.append(successor)
+    
+    def depthFirstSearch(self, start):
+        """Yields the vertices reachable from the start vertex, including itself, in depth-first preorder."""
+        graph = self._readable()
+        visited = {start}
+        yield start
+        stack = [graph.__successors(start)]
+        while stack:
+            successor = next(stack[-1], None)
+            if successor is None:
+                stack.pop()
+            elif successor not in visited:
+                visited.add(successor)
+                yield successor
+                stack.append(graph.__successors(successor))
+    
+    def isReachable(self, source, destination) -> bool:
+        return any(vertex == destination for vertex in self.breadthFirstSearch(source))
+    
+    def topologicalOrder(self):
+        """Yields the vertices so that every edge points forward. Raises an exception if the graph has a cycle."""
+        graph = self._readable()
+        inDegrees = {vertex: 0 for vertex, _timestamp in graph.__vertices}
+        for _name, source, destination in graph.__indexedEdges.values():
+            inDegrees.setdefault(source, 0)
+            inDegrees[destination] = inDegrees.get(destination, 0) + 1
+        
+        queue = deque(vertex for vertex, inDegree in inDegrees.items() if inDegree == 0)
+        ordered = 0
+        while queue:
+            vertex = queue.popleft()
+            ordered += 1
+            yield vertex
+            for successor in graph.__successors(vertex):
+                inDegrees[successor] -= 1
+                if inDegrees[successor] == 0:
+                    queue.append(successor)
+        
+        if ordered < len(inDegrees):
+            raise Exception("The graph has a cycle.")
+    
+    def connectedComponents(self):
+        """Yields the weakly connected components of the graph as sets of vertices."""
+        graph = self._readable()
+        vertices = dict.fromkeys(vertex for vertex, _timestamp in graph.__vertices)
+        for _name, source, destination in graph.__indexedEdges.values():
+            vertices[source] = None
+            vertices[destination] = None
+        
+        visited = set()
+        for vertex in vertices:
+            if vertex in visited:
+                continue
+            component = {vertex}
+            stack = [vertex]
+            while stack:
+                current = stack.pop()
+                for neighbour in itertools.chain(graph.__successors(current), graph.__predecessors(current)):
+                    if neighbour not in component:
+                        component.add(neighbour)
+                        stack.append(neighbour)
+            visited |= component
+            yield component
+    
+    """Replication"""
+    
+    @synchronized
+    def merge(self, other):
+        other = other._readable()
+        super().merge(other)
+        self.__vertices.merge(other.__vertices)
+        self.__edges.merge(other.__edges)
+        
+        for edge in list(other.__edges._addIndex) + list(other.__edges._removeIndex):
+            self.__indexEdge(edge)
+    
+    @synchronized
+    def deltaSince(self, version: int):
+        return (super().deltaSince(version), self.__vertices.deltaSince(version), self.__edges.deltaSince(version))
+    
+    @synchronized
+    def applyDelta(self, delta):
+        mapDelta, verticesDelta, edgesDelta = delta
+        super().applyDelta(mapDelta)
+        self.__vertices.applyDelta(verticesDelta)
+        self.__edges.applyDelta(edgesDelta)
+        
+        edgeAdds, edgeRemoves, _clearedBefore = edgesDelta
+        for edge, _timestamp in edgeAdds + edgeRemoves:
+            self.__indexEdge(edge)
+    
+    def changesBetween(self, fromTimestamp: int, toTimestamp: int):
+        """Streams the changes of the graph, its vertices and its edges, in the order of their timestamps."""
+        for _timestamp, _version, isRemoval, entry in self._collected(self.__timelineBetween, fromTimestamp, toTimestamp):
+            yield (isRemoval, entry)
+    
+    @synchronized
+    def digest(self) -> int:
+        return rootDigest((rootDigest(super().bucketDigests(), self._clearedBefore), self.__vertices.digest(), self.__edges.digest()), None)
+    
+    @synchronized
+    def bucketDigests(self):
+        return (super().bucketDigests(), self.__vertices.bucketDigests(), self.__edges.bucketDigests())
+    
+    def differingBuckets(self, otherBucketDigests):
+        return tuple(differingBuckets(digests, otherDigests) for digests, otherDigests in zip(self.bucketDigests(), otherBucketDigests))
+    
+    @synchronized
+    def deltaOfBuckets(self, buckets):
+        mapBuckets, vertexBuckets, edgeBuckets = buckets
+        return (super().deltaOfBuckets(mapBuckets), self.__vertices.deltaOfBuckets(vertexBuckets),
+                self.__edges.deltaOfBuckets(edgeBuckets))
+    
+    @synchronized
+    def snapshot(self):
+        if self._readOnly:
+            return self
+        
+        snapshot = super().snapshot()
+        snapshot.__vertices = self.__vertices.snapshot()
+        snapshot.__edges = self.__edges.snapshot()
+        snapshot.__outEdges = snapshot._viewOf(self.__outEdges)
+        snapshot.__inEdges = snapshot._viewOf(self.__inEdges)
+        snapshot.__edgesByName = snapshot._viewOf(self.__edgesByName)
+        snapshot.__indexedEdges = snapshot._viewOf(self.__indexedEdges)
+        return snapshot
+    
+    """Compaction"""
+    
+    @synchronized
+    def compact(self, watermark: int):
+        super().compact(watermark)
+        self.__vertices.compact(watermark)
+        self.__edges.compact(watermark)
+        
+        for vertex, _timestamp in self.__vertices:
+            if hasattr(vertex, 'compact'):  # vertices may be plain values
+                vertex.compact(watermark)
+        for edge, _timestamp in self.__edges:
+            edge.compact(watermark)
     
     """Internal methods"""
+    
+    def _memoryReport(self, seen):
+        """Extends the report of the graph as a map with the reports of its vertices, edges and edge indexes."""
+        report = super()._memoryReport(seen)
+        graph = self._readable()
+        report['vertices'] = graph.__vertices._memoryReport(seen)
+        report['edges'] = graph.__edges._memoryReport(seen)
+        
+        indexes = graph.__outEdges, graph.__inEdges, graph.__edgesByName
+        report['indexes'] = {'bytes': sum(sys.getsizeof(index) + sum(sys.getsizeof(edges) for edges in index.values() if isinstance(edges, dict))
+                                          for index in indexes)
+                             + sys.getsizeof(graph.__indexedEdges) + sum(sys.getsizeof(indexed) for indexed in graph.__indexedEdges.values())}
+        report['bytes'] += report['vertices']['bytes'] + report['edges']['bytes'] + report['indexes']['bytes']
+        return report
+    
+    @synchronized
+    def _edgeChanged(self, edge):
+        """Re-indexes an edge of the graph by its current name and endpoints (see LWWEdge)."""
+        if edge in self.__indexedEdges:
+            self.__unindexEdge(edge)
+        self.__indexEdge(edge)
+    
+    def __timelineBetween(self, fromTimestamp, toTimestamp):
+        return heapq.merge(self._timelineBetween(fromTimestamp, toTimestamp),
+                           self.__vertices._timelineBetween(fromTimestamp, toTimestamp),
+                           self.__edges._timelineBetween(fromTimestamp, toTimestamp))
+    
+    def __successors(self, vertex):
+        indexedEdges = self.__indexedEdges
+        return (indexedEdges[edge][2] for edge in self.__edgesOf(self.__outEdges, vertex))
+    
+    def __predecessors(self, vertex):
+        indexedEdges = self.__indexedEdges
+        return (indexedEdges[edge][1] for edge in self.__edgesOf(self.__inEdges, vertex))
+    
+    def __removeEdge(self, edge, timestamp):
+        self.__edges.remove(edge, timestamp)
+        self.__indexEdge(edge)
+    
+    def __indexEdge(self, edge):
+        """Keeps the name and adjacency indexes in line with the existence of the edge."""
+        if self.__edges.lookup(edge):
+            if edge not in self.__indexedEdges:
+                self.__index(edge, edge.query("name"), edge.query("from"), edge.query("to"))
+        elif edge in self.__indexedEdges:
+            self.__unindexEdge(edge)
+    
+    def __unindexEdge(self, edge):
+        if self._snapshots:
+            self._preserve(self.__indexedEdges, edge)
+        name, source, destination = self.__indexedEdges.pop(edge)
+        self.__unindex(self.__edgesByName, name, edge)
+        self.__unindex(self.__outEdges, source, edge)
+        self.__unindex(self.__inEdges, destination, edge)
+    
+    def __index(self, edge, name, source, destination):
+        if self._snapshots:
+            self._preserve(self.__indexedEdges, edge)
+        self.__indexedEdges[edge] = (name, source, destination)
+        self.__addToIndex(self.__edgesByName, name, edge)
+        self.__addToIndex(self.__outEdges, source, edge)
+        self.__addToIndex(self.__inEdges, destination, edge)
+    
+    def __timestampColumn(self, timestamps, count, items):
+        """Returns the single timestamp, or the column of timestamps as a list, checking that it has a timestamp per item."""
+        if isinstance(timestamps, int):
+            return itertools.repeat(timestamps, count)
+        timestamps = list(timestamps)
+        if len(timestamps) != count:
+            raise Exception("Expected {} timestamps for the {}, got {}.".format(count, items, len(timestamps)))
+        return timestamps
+    
+    def __edgesOf(self, index, key):
+        """
+        Edges of the key in the index. Indexes store the single edge of a key directly, which is the typical case,
+        and the edges of a key in a dict (used as an ordered set) once there are more.
+        """
+        edges = index.get(key)
+        if edges is None:
+            return ()
+        return edges if isinstance(edges, dict) else (edges,)
+    
+    def __addToIndex(self, index, key, edge):
+        edges = index.get(key)
+        if self._snapshots:  # the snapshots keep the current edges of the key
+            self._preserve(index, key)
+            if isinstance(edges, dict):
+                edges = dict(edges)
+        
+        if edges is None:
+            index[key] = edge
+        elif isinstance(edges, dict):
+            edges[edge] = None
+            index[key] = edges
+        else:
+            index[key] = {edges: None, edge: None}
+    
+    def __unindex(self, index, key, edge):
+        edges = index[key]
+        if self._snapshots:
+            self._preserve(index, key)
+            if isinstance(edges, dict):
+                edges = dict(edges)
+        
+        if not isinstance(edges, dict) or len(edges) == 1:
+            del index[key]
+        else:
+            del edges[edge]
+            index[key] = edges
         
     def __queryEdgeByName(self, edgeName):
-        for edge, _timestamp in self.__edges:
-            if edge.query("name") == edgeName:
-                return edge
-            
-        return None
+        edges = self.__edgesOf(self.__edgesByName, edgeName)
+        return next(iter(edges), None)
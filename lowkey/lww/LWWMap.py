@@ -1,6 +1,9 @@
 #!/usr/bin/env python
+from collections.abc import Set
+
 from lowkey.lww import LWWMap
 from lowkey.lww.LWWSet import LWWSet
+from lowkey.lww.Synchronization import synchronized
 
 __author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -11,30 +14,33 @@ __license__ = "GPL-3.0"
 LWWMap data type.
 Loosely based on the specification https://hal.inria.fr/file/index/docid/555588/filename/techreport.pdf.
 
-Extends the LWWSet type.
+Extends the LWWSet type. The existing entries are indexed by their keys, so that the winning value of a
+key is queried in constant time.
 """
 
 
-class ViewSet():
+class ViewSet(Set):
+    """
+    Live view of the existing entries of an LWWMap, reflecting every later change of the map.
+    Being a collections.abc.Set, it supports len, membership and set comparisons without copying the
+    view, and set algebra (&, |, -, ^) producing built-in sets.
+    """
     
     def __init__(self, lwwMap:LWWMap):
         self._lwwMap = lwwMap
         
-    def _collectViewElements(self):
+    def _viewElements(self):
         raise NotImplementedError
         
     def __iter__(self):
-        self._collectViewElements()
-        self.__currentIteratorIndex = len(self._viewElements)
-        return self
-
-    def __next__(self):
-        if self.__currentIteratorIndex > 0:
-            self.__currentIteratorIndex -= 1
-            viewElement = self._viewElements[self.__currentIteratorIndex]
-            return viewElement 
-        else: 
-            raise StopIteration
+        yield from self._lwwMap._iterable(self._viewElements())
+    
+    def __len__(self):
+        return len(self._lwwMap._existingView)
+    
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
 
 
 class EntrySet(ViewSet):
@@ -42,10 +48,15 @@ class EntrySet(ViewSet):
     def __init__(self, lwwMap:LWWMap):
         super().__init__(lwwMap)
             
-    def _collectViewElements(self):
-        self._viewElements = list()
-        for (key, value), timestamp in self._lwwMap._existing():
-            self._viewElements.append(((key, value), timestamp))
+    def _viewElements(self):
+        return self._lwwMap._existingView.values()
+    
+    def __contains__(self, entry):
+        try:
+            (key, _), _ = entry
+            return self._lwwMap._existingView.get(key) == entry
+        except (TypeError, ValueError):
+            return False
 
 
 class KeySet(ViewSet):
@@ -53,10 +64,11 @@ class KeySet(ViewSet):
     def __init__(self, lwwMap:LWWMap):
         super().__init__(lwwMap)
             
-    def _collectViewElements(self):
-        self._viewElements = list()
-        for (key, _), _ in self._lwwMap._existing():
-            self._viewElements.append(key)
+    def _viewElements(self):
+        return self._lwwMap._existingView.keys()
+    
+    def __contains__(self, key):
+        return self._lwwMap.lookup(key)
 
 
 class LWWMap(LWWSet):
@@ -75,34 +87,32 @@ class LWWMap(LWWSet):
     """Interface methods"""
     
     def query(self, key):
-        query = next((entry for entry in self._existing() if self._lookupFunction(entry) == key), None)
-        return self._getValue(query) if query else None
+        entry = self._existingView.get(key)
+        return self._getValue(entry) if entry else None
     
     def lookup(self, key) -> bool:
         return super().lookup(key)
     
+    @synchronized
     def add(self, key=None, value=None, timestamp: int=0) -> bool:
-        if any(key == self._lookupFunction(addedValue) and timestamp < self._getTimestamp(addedValue) for addedValue in self._addSet):  # LWW
-            return False
-        
-        self._addSet.add(((key, value), timestamp))
-        return True
+        return self._addEntry(((key, value), timestamp))
     
+    @synchronized
     def remove(self, key, timestamp: int):
-        if any(key == self._lookupFunction(removedValue) and timestamp < self._getTimestamp(removedValue) for removedValue in self._removeSet):  # LWW
-            return False
-        self._removeSet.add(((key, self.query(key)), timestamp))
+        return self._removeEntry(((key, self.query(key)), timestamp))
     
+    @synchronized
+    def addAll(self, keys, values, timestamps):
+        self._addEntries(((key, value), timestamp) for key, value, timestamp in zip(keys, values, self._timestampsOf(timestamps)))
+    
+    @synchronized
+    def removeAll(self, keys, timestamps):
+        self._removeEntries(((key, self.query(key)), timestamp) for key, timestamp in zip(keys, self._timestampsOf(timestamps)))
+    
+    @synchronized
     def update(self, key, newValue, timestamp):
-        self.remove(key, timestamp - 1)  # reduce timestamp by 1ns to avoid identical timestamps
+        self.remove(key, timestamp)  # at the same timestamp, as adds win ties against removes
         self.add(key, newValue, timestamp)
-                    
-    def clear(self, timestamp: int):
-        if(self.size() == 0):
-            return
-        
-        for (key, value), _ in self._existing():
-            self.remove((key, value), timestamp)
 
     """ Internal methods """
 
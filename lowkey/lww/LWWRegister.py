@@ -1,7 +1,12 @@
 #!/usr/bin/env python
+import sys
+import threading
 import uuid
 
 from lowkey.lww import LWWRegister
+from lowkey.lww.Digests import precedes
+from lowkey.lww.Synchronization import synchronized
+from lowkey.lww.Versioning import addContainer, notifyContainers, registerNested
 
 __author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -11,11 +16,19 @@ __license__ = "GPL-3.0"
 """
 LWWRegister data type.
 Based on Specification 9 in https://hal.inria.fr/file/index/docid/555588/filename/techreport.pdf.
+
+Registers are compact: they have no instance dictionary, and they are identified (compared and hashed)
+by their immutable id, so that they can be stored in hash-based collections even if their values change.
+Instead of a generated uuid, an identifier can be supplied, e.g., an int, or a string, which is interned.
+
+In thread-safe mode, updates are serialized by a lock, so that the value and the timestamp change together.
 """
 
 
 class LWWRegister():
     
+    __slots__ = ('__id', '__value', '__timestamp', '__version', '__readOnly', '_lock', '__containers', '__weakref__')
+    
     def __eq__(self, other):
         """Overrides the default implementation"""
         if isinstance(other, LWWRegister):
@@ -24,23 +37,100 @@ class LWWRegister():
     
     def __hash__(self):
         """Overrides the default implementation"""
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(self.__id)
     
-    def __init__(self, value=None, timestamp:int=0, prototype:LWWRegister=None):
-        self.__id = prototype.getId() if prototype else uuid.uuid1()
+    def __init__(self, value=None, timestamp:int=0, prototype:LWWRegister=None, identifier=None):
+        if prototype:
+            self.__id = prototype.getId()
+        elif identifier is not None:
+            self.__id = sys.intern(identifier) if isinstance(identifier, str) else identifier
+        else:
+            self.__id = uuid.uuid1()
         self.__value = prototype.query() if prototype and prototype.query() else value
         self.__timestamp = timestamp
+        self.__version = 0
+        self.__readOnly = False
+        self._lock = None
+        self.__containers = None  # structures containing this register (see Versioning.addContainer)
+        registerNested(self.__value, self)
+    
+    def __getstate__(self):
+        return (self.__id, self.__value, self.__timestamp, self.__version, self.__readOnly, self._lock is not None)
+    
+    def __setstate__(self, state):
+        self.__id, self.__value, self.__timestamp, self.__version, self.__readOnly, threadSafe = state
+        self._lock = threading.RLock() if threadSafe else None
+        self.__containers = None
+        registerNested(self.__value, self)
     
     def query(self):
         return self.__value
     
+    @synchronized
     def update(self, newValue, timestamp: int):
-        if timestamp > self.__timestamp:
+        if self.__readOnly:
+            raise Exception("Snapshots are read-only.")
+        if precedes(self.__timestamp, self.__value, timestamp, newValue):  # LWW, ties broken by the values
             self.__value = newValue
             self.__timestamp = timestamp
+            registerNested(newValue, self)
+            self.__nextVersion()
+    
+    def merge(self, other):
+        self.update(other.query(), other.getTimestamp())
+    
+    @synchronized
+    def deltaSince(self, version: int):
+        return (self.__value, self.__timestamp) if self.__version > version else None
+    
+    def applyDelta(self, delta):
+        if delta:
+            self.update(*delta)
+    
+    def makeThreadSafe(self):
+        if self._lock is None:
+            self._lock = threading.RLock()
+        return self
+    
+    def isThreadSafe(self) -> bool:
+        return self._lock is not None
+    
+    @synchronized
+    def snapshot(self):
+        """Returns a read-only copy of the register."""
+        if self.__readOnly:
+            return self
+        
+        snapshot = LWWRegister(None, self.__timestamp, identifier=self.__id)
+        snapshot.__value = self.__value  # not registered as a container of the value, as snapshots do not change
+        snapshot.__version = self.__version
+        snapshot.__readOnly = True
+        return snapshot
     
     def getId(self):
         return self.__id
     
     def getTimestamp(self):
         return self.__timestamp
+    
+    def getVersion(self) -> int:
+        return self.__version
+    
+    def changedSince(self, version: int) -> bool:
+        """Whether the register, or any structure stored in it, changed after the given local version."""
+        return self.__version > version
+    
+    """ Internal methods """
+    
+    def __nextVersion(self):
+        self.__version += 1
+        if self.__containers:
+            notifyContainers(self.__containers, {id(self)})
+    
+    def _addContainer(self, container):
+        self.__containers = addContainer(self.__containers, container)
+    
+    def _nestedChanged(self, visited):
+        self.__version += 1
+        if self.__containers:
+            notifyContainers(self.__containers, visited)
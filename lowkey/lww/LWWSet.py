@@ -1,5 +1,17 @@
 #!/usr/bin/env python
+import bisect
+import heapq
+import itertools
+import math
+import sys
+import threading
 import uuid
+import weakref
+
+from lowkey.lww.Digests import bucketOf, differingBuckets, keyDigest, precedes, rootDigest, BUCKETS
+from lowkey.lww.SnapshotView import SnapshotView
+from lowkey.lww.Synchronization import synchronized
+from lowkey.lww.Versioning import addContainer, notifyContainers, registerNested
 
 _author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -20,102 +32,568 @@ The value exists iff:
 ---there exists a corresponding entry in the removeSet, but with a smaller timestamp.
 
 Otherwise the value does not exist.
+
+Besides the addSet and the removeSet, the latest add entry and the latest remove timestamp of every
+value are indexed by the value, which makes adding, removing and looking up values constant time.
+The currently existing values are kept in a view that is updated by every add and remove, so that
+reads (lookup, size, iteration) do not have to recompute existence. The set must not be modified while being
+iterated over; iterate over a list(...) of the set for that.
+
+Every accepted add and remove increments a local version counter. The addSet and the removeSet map their
+entries to the versions that recorded them, in the order of the versions, as every entry is recorded once.
+The entries added since a given version can thus be extracted from their ends as a delta and applied to
+another replica (delta-state replication). Changes of the structures stored in the values increment the
+version counter too (see Versioning). To stream the changes of a given time range, the changes are sorted
+by their timestamps on the first request; later changes are appended, or, if out of order, inserted into a
+sorted tail that queries merge with the timeline, and that is merged into the timeline once it outgrows a fraction of it.
+
+Replicas are compared by bucketed digests of their existing entries (see Digests), which are built on the first request
+and updated by every later change of the existing entries. Only the deltas of the differing buckets need to be exchanged to resynchronize.
+
+Clearing the set does not remove the values one by one, but raises a range tombstone: every value whose
+latest add is older than the tombstone is removed, including the values whose add arrives later.
+
+Snapshots are read-only views taken in constant time: they share the internal structures with the set, which
+preserves the previous state of every key it writes in the views of its snapshots (see SnapshotView), so that
+a write costs constant time per snapshot alive, instead of copying the structures.
+
+In thread-safe mode, writes are serialized by a lock. Reads whose result is proportional to the changes they
+return (deltas, change streams) collect it holding the lock, while other reads do not block the writers:
+iterations run over a copy of the view, and reads spanning multiple structures (merges, traversals) run over a
+snapshot. Thread-safe mode must be turned on before the set is shared between threads.
 """
 
+TIMELINE_TAIL_LIMIT = 1024  # number of out-of-order changes kept aside at least...
+TIMELINE_TAIL_RATIO = 32  # ...or the fraction of the timeline, before they are merged into it
+
+
+class _FrozenVersion():
+    """Version of a snapshot. Snapshots do not refer to themselves, so that they are freed as soon as they are unused."""
+    
+    __slots__ = ('_version',)
+    
+    def __init__(self, version):
+        self._version = version
+
     
 class LWWSet():
             
     def __init__(self):
-        self._addSet = set()
-        self._removeSet = set()
-        self._id = uuid.uuid1()
+        self._addSet = dict()  # add entry -> local version of the change, in the order of versions
+        self._removeSet = dict()  # remove entry -> local version of the change, in the order of versions
+        self._addIndex = dict()  # lookup key -> latest add entry
+        self._removeIndex = dict()  # lookup key -> latest remove timestamp
+        self._existingView = dict()  # lookup key -> latest add entry of the currently existing values
+        self._timeline = None  # (timestamp, version, isRemoval, entry) of the changes in the order of timestamps, built on demand
+        self._timelineTail = []  # the changes older than the end of the timeline, in the order of timestamps
+        self._clearedBefore = -math.inf  # range tombstone: values added before this timestamp are removed
+        self._clearedVersion = 0  # local version of the latest clear
+        self._latestAddTimestamp = -math.inf
+        self._version = 0
+        self._versionSource = self  # structure whose version counter stamps the changes of this set
+        self._readOnly = False
+        self._snapshots = None  # weak references to the snapshots viewing the internal structures
+        self._views = None  # in snapshots: views of the internal structures of the origin, by the ids of the structures
+        self._lock = None  # reentrant lock of the writers in thread-safe mode
+        self._containers = None  # structures containing this one (see Versioning.addContainer)
+        self._digests = None  # digests of the buckets, built on demand
+        self._id = None  # generated on demand, as it is costly for many small structures (e.g., edges)
     
     def __iter__(self):
-        self.__currentlyExisting = self._existing()
-        self.__currentIteratorIndex = len(self.__currentlyExisting)
-        return self
-
-    def __next__(self):
-        if self.__currentIteratorIndex > 0:
-            self.__currentIteratorIndex -= 1
-            element = self.__currentlyExisting[self.__currentIteratorIndex]
-            return element
-        else: 
-            raise StopIteration
+        """Streams the existing entries. Every iteration has its own iterator, so iterations can be nested."""
+        yield from self._iterable(self._existingView.values())
+    
+    def __getstate__(self):
+        self.getId()  # copies share the id
+        state = self.__dict__.copy()
+        state['_lock'] = self._lock is not None  # locks are not copied, but created anew
+        state['_containers'] = None  # copies register with the copies of their containers
+        state['_digests'] = None  # rebuilt on demand
+        state['_snapshots'] = None
+        if self._views is not None:  # copies of snapshots own their structures
+            state.update([(name, dict(value.items())) for name, value in state.items() if isinstance(value, SnapshotView)])
+            state['_views'] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock() if state['_lock'] else None
+        if not self._readOnly:
+            for entry in self._addSet:
+                registerNested(entry[0], self._versionSource)
     
     """Interface methods"""
     
     def getId(self):
+        if self._id is None:
+            self._id = uuid.uuid1()
         return self._id
     
+    def getVersion(self) -> int:
+        return self._versionSource._version
+    
+    def changedSince(self, version: int) -> bool:
+        """Whether the set, or any structure stored in it, changed after the given local version."""
+        return self._versionSource._version > version
+    
+    def makeThreadSafe(self):
+        if self._lock is None:
+            self._lock = threading.RLock()
+        return self
+    
+    def isThreadSafe(self) -> bool:
+        return self._lock is not None
+    
     def lookup(self, value) -> bool:
-        return any(value == self._lookupFunction(existing) for existing in self._existing())
+        return self._exists(value)
         
+    @synchronized
     def add(self, newValue, timestamp: int) -> bool:
-        if any(newValue == self._lookupFunction(addedValue) and timestamp < self._getTimestamp(addedValue) for addedValue in self._addSet):  # LWW
-            return False
-        
-        self._addSet.add((newValue, timestamp))
-        return True
-            
+        return self._addEntry((newValue, timestamp))
+    
+    @synchronized
     def remove(self, value, timestamp: int):
-        if any(value == self._lookupFunction(removedValue) and timestamp < self._getTimestamp(removedValue) for removedValue in self._removeSet):  # LWW
-            return False
-        self._removeSet.add((value, timestamp))
+        return self._removeEntry((value, timestamp))
+    
+    @synchronized
+    def addAll(self, values, timestamps):
+        """
+        Adds a batch of values. The timestamps are either given in an iterable parallel to the values, or as a
+        single timestamp of the whole batch. Only the latest add of every value in the batch is processed.
+        """
+        self._addEntries(zip(values, self._timestampsOf(timestamps)))
     
+    @synchronized
+    def removeAll(self, values, timestamps):
+        self._removeEntries(zip(values, self._timestampsOf(timestamps)))
+    
+    @synchronized
     def clear(self, timestamp: int):
-        if(self.size() == 0):
+        """Removes every value added before the timestamp by raising the range tombstone of the set."""
+        self._beforeWrite()
+        if not timestamp > self._clearedBefore:  # LWW
             return
         
-        for value, _ in self._existing():
-            self.remove(value, timestamp)
+        self._clearedBefore = timestamp
+        self._clearedVersion = self._nextVersion()
+        if self._digests is not None:
+            for key, entry in self._existingView.items():
+                if self._getTimestamp(entry) < timestamp:
+                    self._digests[bucketOf(key)] ^= keyDigest(key, entry)
+        if self._latestAddTimestamp < timestamp:
+            self._existingView = dict()
+        else:
+            self._existingView = {key: entry for key, entry in self._existingView.items() if not self._getTimestamp(entry) < timestamp}
     
     def size(self) -> int:
-        if(len(self._addSet) == 0):
-            return 0
+        return len(self._existingView)
+    
+    @synchronized
+    def merge(self, other):
+        """
+        State-based merge: the union of the add and remove sets, and the later range tombstone of the two replicas.
+        Other LWW sets providing deltas (e.g., LWWColumnarSet) are merged by their full deltas.
+        """
+        if not isinstance(other, LWWSet):
+            self.applyDelta(other.deltaSince(0))
+            return
+        
+        other = other._readable()
+        for entry in other._addSet:
+            self._addEntry(entry)
+        for entry in other._removeSet:
+            self._removeEntry(entry)
+        self.clear(other._clearedBefore)
+    
+    @synchronized
+    def deltaSince(self, version: int):
+        """
+        Returns the (add entries, remove entries, range tombstone) delta of the changes after the given local version.
+        The range tombstone is None if the set has not been cleared since the version.
+        """
+        clearedBefore = self._clearedBefore if self._clearedVersion > version else None
+        return (self._changesAfter(self._addSet, version), self._changesAfter(self._removeSet, version), clearedBefore)
+    
+    @synchronized
+    def applyDelta(self, delta):
+        adds, removes, clearedBefore = delta
+        for entry in adds:
+            self._addEntry(entry)
+        for entry in removes:
+            self._removeEntry(entry)
+        if clearedBefore is not None:
+            self.clear(clearedBefore)
+    
+    def digest(self) -> int:
+        """Root digest of the existing entries and the range tombstone. Replicas of equal root digests have the same values."""
+        return rootDigest(self.bucketDigests(), self._clearedBefore)
+    
+    @synchronized
+    def bucketDigests(self):
+        if self._digests is None:
+            self._digests = self._buildDigests()
+        return tuple(self._digests)
+    
+    def differingBuckets(self, otherBucketDigests):
+        """Returns the buckets whose digests differ from the bucket digests of another replica."""
+        return differingBuckets(self.bucketDigests(), otherBucketDigests)
+    
+    @synchronized
+    def deltaOfBuckets(self, buckets):
+        """
+        Returns the (add entries, remove entries, range tombstone) delta of the latest adds and removes of the keys in
+        the buckets. Applied to another replica, it makes the digests of those buckets equal.
+        """
+        buckets = set(buckets)
+        adds = tuple(entry for key, entry in self._addIndex.items() if bucketOf(key) in buckets)
+        removes = tuple(entry for entry in self._removeSet if self._removeIndex.get(self._lookupFunction(entry)) == self._getTimestamp(entry)
+                        and bucketOf(self._lookupFunction(entry)) in buckets)
+        return (adds, removes, self._clearedBefore)
+    
+    @synchronized
+    def snapshot(self):
+        """
+        Returns a read-only snapshot of the set in constant time. The snapshot views the internal structures of
+        the set, which preserves the previous state of the keys it writes later in the views.
+        """
+        if self._readOnly:
+            return self
+        
+        self.getId()  # snapshots share the id
+        snapshot = object.__new__(type(self))
+        snapshot.__dict__.update(self.__dict__)
+        snapshot._readOnly = True
+        snapshot._containers = None
+        snapshot._snapshots = None
+        snapshot._views = dict()
+        snapshot._addSet = snapshot._viewOf(self._addSet)
+        snapshot._removeSet = snapshot._viewOf(self._removeSet)
+        snapshot._addIndex = snapshot._viewOf(self._addIndex)
+        snapshot._removeIndex = snapshot._viewOf(self._removeIndex)
+        snapshot._existingView = snapshot._viewOf(self._existingView)
+        snapshot._timeline = None  # rebuilt on demand, as the set appends to its timeline
+        snapshot._timelineTail = []
+        if self._digests is not None:
+            snapshot._digests = list(self._digests)
+        snapshot._versionSource = _FrozenVersion(self.getVersion())
+        
+        self._snapshots = [reference for reference in self._snapshots or () if reference() is not None]
+        self._snapshots.append(weakref.ref(snapshot))
+        return snapshot
+    
+    def changesSince(self, timestamp: int):
+        return self.changesBetween(timestamp, None)
+    
+    def changesBetween(self, fromTimestamp: int, toTimestamp: int):
+        """
+        Streams the (isRemoval, entry) changes with fromTimestamp < timestamp <= toTimestamp in the order of
+        their timestamps. The range is open-ended if toTimestamp is None.
+        """
+        for _timestamp, _version, isRemoval, entry in self._collected(self._timelineBetween, fromTimestamp, toTimestamp):
+            yield (isRemoval, entry)
+    
+    @synchronized
+    def compact(self, watermark: int):
+        """
+        Drops the entries that no longer influence the state of the set, given that no operation older
+        than the watermark can arrive anymore: dominated add entries and tombstones older than the watermark,
+        together with every add entry of values whose removal is older than the watermark, or that are cleared.
+        The existing entries, and thus the digests, are unchanged.
+        """
+        self._beforeWrite()  # the structures are rebuilt rather than written, so that the snapshots keep the current ones
+        self._removeIndex = {key: lastRemoved for key, lastRemoved in self._removeIndex.items() if not lastRemoved < watermark}
+        self._addIndex = {key: entry for key, entry in self._addIndex.items()
+                          if key in self._existingView or key in self._removeIndex}  # others are removed stably or by the range tombstone
         
-        return len(list(self._existing()))
+        self._addSet = {entry: version for entry, version in self._addSet.items() if self._lookupFunction(entry) in self._addIndex
+                        and (not self._getTimestamp(entry) < watermark or self._addIndex[self._lookupFunction(entry)] == entry)}
+        self._removeSet = {entry: version for entry, version in self._removeSet.items() if not self._getTimestamp(entry) < watermark}
+        self._timeline = None
+    
+    def memoryReport(self):
+        """
+        Reports the number of entries and their approximate size in bytes (by sys.getsizeof) per category: the live
+        entries, the tombstones, the dominated add entries (that do not make their values exist), the internal
+        structures (sets, indexes, change log), and the nested CRDTs stored in the values, which are counted once.
+        """
+        return self._memoryReport(set())
     
     """ Internal methods """
-
+    
+    def _memoryReport(self, seen):
+        seen.add(id(self))
+        source = self._readable()
+        nested = {'objects': 0, 'bytes': 0}
+        live = list(source._existingView.values())
+        dominated = [entry for entry in source._addSet if source._existingView.get(self._lookupFunction(entry)) != entry]
+        timeline = (source._timeline or []) + source._timelineTail
+        structures = timeline, source._addSet, source._removeSet, source._addIndex, source._removeIndex, source._existingView
+        
+        report = {
+            'live': self._entriesReport(live, seen, nested),
+            'dominated': self._entriesReport(dominated, seen, nested),
+            'tombstones': self._entriesReport(source._removeSet, seen, nested),
+            'structures': {'bytes': sum(sys.getsizeof(structure) for structure in structures)
+                           + sum(sys.getsizeof(change) for change in timeline)},
+            'nested': nested
+        }
+        report['bytes'] = sum(category['bytes'] for category in report.values())
+        return report
+    
+    def _entriesReport(self, entries, seen, nested):
+        return {'entries': len(entries), 'bytes': sum(self._sizeOf(entry, seen, nested) for entry in entries)}
+    
+    def _sizeOf(self, value, seen, nested):
+        """Size of the value, without the nested CRDTs, which are reported once in the nested category."""
+        if hasattr(value, '_memoryReport'):
+            if id(value) not in seen:
+                report = value._memoryReport(seen)
+                nested['objects'] += 1 + report['nested']['objects']
+                nested['bytes'] += report['bytes']
+            return 0
+        
+        size = sys.getsizeof(value)
+        if isinstance(value, tuple):
+            size += sum(self._sizeOf(element, seen, nested) for element in value)
+        return size
+    
     def _lookupFunction(self, entry):
         return entry[0]
     
     def _getTimestamp(self, entry):
         return entry[1]
-
-    def _existing(self):
-        if len(self._addSet) == 0:
-            return list()
+    
+    def _buildDigests(self):
+        digests = [0] * BUCKETS
+        for key, entry in self._existingView.items():
+            digests[bucketOf(key)] ^= keyDigest(key, entry)
+        return digests
+    
+    def _updateDigest(self, key, previousEntry):
+        """Replaces the digest of the previous state of the key by the digest of its current state."""
+        self._digests[bucketOf(key)] ^= keyDigest(key, previousEntry) ^ keyDigest(key, self._existingView.get(key))
+    
+    def _readable(self):
+        """Returns the set, or in thread-safe mode a snapshot of it, to read multiple structures of."""
+        return self if self._lock is None else self.snapshot()
+    
+    def _iterable(self, container):
+        """Returns the container, or in thread-safe mode a copy of it, to iterate over."""
+        return container if self._lock is None else tuple(container)
+    
+    def _collected(self, streamFunction, *args):
+        """Returns the stream of the function, or in thread-safe mode a list of it, collected holding the lock."""
+        if self._lock is None:
+            return streamFunction(*args)
+        with self._lock:
+            return list(streamFunction(*args))
+    
+    def _beforeWrite(self):
+        if self._readOnly:
+            raise Exception("Snapshots are read-only.")
+    
+    def _viewOf(self, structure):
+        """Returns the view of a structure of the origin of this snapshot."""
+        view = SnapshotView(structure)
+        self._views[id(structure)] = view
+        return view
+    
+    def _preserve(self, structure, key):
+        """Preserves the state of the key in the views of the structure taken by the snapshots alive, before writing the key."""
+        alive = False
+        for reference in self._snapshots:
+            snapshot = reference()
+            if snapshot is not None:
+                alive = True
+                view = snapshot._views.get(id(structure))
+                if view is not None and view._live is structure:
+                    view.preserve(key)
+        if not alive:
+            self._snapshots = None
+    
+    def _addEntry(self, entry) -> bool:
+        self._beforeWrite()
+        key = self._lookupFunction(entry)
+        timestamp = self._getTimestamp(entry)
+        latest = self._addIndex.get(key)
+        if latest is not None and self._precedes(entry, latest):  # LWW
+            return False
+        if entry in self._addSet:  # already known, e.g., merged back from another replica
+            return True
         
-        keyFunc = lambda x: self._getTimestamp(x)
-        # sorting in descending order to start with the likely existing ones and short-circuit the loop below
-        addedEntries = sorted(self._addSet, key=keyFunc, reverse=True)
+        self._recordChange(self._addSet, False, entry)
+        registerNested(entry[0], self._versionSource)
+        if latest is None or self._precedes(latest, entry):
+            if self._snapshots:
+                self._preserve(self._addIndex, key)
+            self._addIndex[key] = entry
+            self._latestAddTimestamp = max(self._latestAddTimestamp, timestamp)
+            self._refreshView(key)
+        return True
+    
+    def _removeEntry(self, entry) -> bool:
+        self._beforeWrite()
+        key = self._lookupFunction(entry)
+        timestamp = self._getTimestamp(entry)
+        lastRemoved = self._removeIndex.get(key)
+        if lastRemoved is not None and timestamp < lastRemoved:  # LWW
+            return False
+        if entry in self._removeSet:
+            return True
+        
+        self._recordChange(self._removeSet, True, entry)
+        if self._snapshots:
+            self._preserve(self._removeIndex, key)
+        self._removeIndex[key] = timestamp
+        self._refreshView(key)
+        return True
+    
+    def _addEntries(self, entries):
+        entries = self._latestEntries(entries)
+        if not self._addIndex and not self._removeIndex and self._clearedBefore == -math.inf:
+            self._load(entries)
+            return
         
-        existing = list()
-        for entry in addedEntries:
-            value = self._lookupFunction(entry)
+        for entry in entries:
+            self._addEntry(entry)
+    
+    def _load(self, entries):
+        """Adds entries of distinct lookup keys to the empty set, building the indexes in one pass."""
+        self._beforeWrite()
+        if self._snapshots:  # the snapshots keep the current structures
+            self._addSet, self._addIndex, self._existingView = dict(), dict(), dict()
+        self._digests = None
+        versionSource = self._versionSource
+        for entry in entries:
+            versionSource._version += 1
             timestamp = self._getTimestamp(entry)
-            existingEntry = next(iter([e for e in existing if self._lookupFunction(e) == value]), None)
-            
-            if not existingEntry:
-                if not self._laterRemoveExists(entry):
-                    existing.append(entry)
-                    continue
-            elif self._getTimestamp(existingEntry) < timestamp:
-                existing.remove(existingEntry)
-                existing.append(entry)
-            else:
-                continue
-                
-        return existing
+            self._addIndex[self._lookupFunction(entry)] = entry
+            self._addSet[entry] = versionSource._version
+            registerNested(entry[0], versionSource)
+            if timestamp > self._latestAddTimestamp:
+                self._latestAddTimestamp = timestamp
+        
+        self._existingView.update(self._addIndex)
+        self._timeline = None
+        if versionSource._containers:
+            notifyContainers(versionSource._containers, {id(versionSource)})
+    
+    def _removeEntries(self, entries):
+        for entry in self._latestEntries(entries):
+            self._removeEntry(entry)
+    
+    def _latestEntries(self, entries):
+        """Groups a batch of entries by their lookup keys and keeps the latest entry of every key."""
+        latest = dict()
+        for entry in entries:
+            key = self._lookupFunction(entry)
+            winner = latest.get(key)
+            if winner is None or self._precedes(winner, entry):
+                latest[key] = entry
+        return latest.values()
+    
+    def _timestampsOf(self, timestamps):
+        return itertools.repeat(timestamps) if isinstance(timestamps, int) else timestamps
+    
+    def _nextVersion(self) -> int:
+        versionSource = self._versionSource
+        versionSource._version += 1
+        if versionSource._containers:
+            notifyContainers(versionSource._containers, {id(versionSource)})
+        return versionSource._version
+    
+    def _addContainer(self, container):
+        self._containers = addContainer(self._containers, container)
+    
+    def _nestedChanged(self, visited):
+        versionSource = self._versionSource
+        versionSource._version += 1
+        if versionSource._containers:
+            notifyContainers(versionSource._containers, visited)
+    
+    def _recordChange(self, log, isRemoval, entry):
+        version = self._nextVersion()
+        if self._snapshots:
+            self._preserve(log, entry)
+        log[entry] = version
+        timeline = self._timeline
+        if timeline is not None:
+            change = (self._getTimestamp(entry), version, isRemoval, entry)
+            if not timeline or change > timeline[-1]:
+                timeline.append(change)
+                return
+            tail = self._timelineTail  # out-of-order changes are kept aside, so queries need not sort the timeline
+            bisect.insort(tail, change)
+            if len(tail) > max(TIMELINE_TAIL_LIMIT, len(timeline) // TIMELINE_TAIL_RATIO):
+                self._timeline = list(heapq.merge(timeline, tail))
+                self._timelineTail = []
+    
+    def _changesAfter(self, log, version):
+        """Returns the entries of the log recorded after the version, in the order of versions."""
+        changes = []
+        for entry, changeVersion in reversed(log.items()):
+            if not changeVersion > version:
+                break
+            changes.append(entry)
+        return tuple(reversed(changes))
+    
+    def _sortedTimeline(self):
+        if self._timeline is None:
+            self._timeline = [(self._getTimestamp(entry), version, False, entry) for entry, version in self._addSet.items()]
+            self._timeline += [(self._getTimestamp(entry), version, True, entry) for entry, version in self._removeSet.items()]
+            self._timeline.sort()
+            self._timelineTail = []
+        return self._timeline
+    
+    def _timelineBetween(self, fromTimestamp, toTimestamp):
+        timeline = self._sortedTimeline()
+        changes = self._timelineFrom(timeline, fromTimestamp)
+        if self._timelineTail:
+            changes = heapq.merge(changes, self._timelineFrom(self._timelineTail, fromTimestamp))
+        for change in changes:
+            if toTimestamp is not None and change[0] > toTimestamp:
+                return
+            yield change
+    
+    @staticmethod
+    def _timelineFrom(timeline, fromTimestamp):
+        i = bisect.bisect_right(timeline, (fromTimestamp, math.inf))
+        while i < len(timeline):
+            yield timeline[i]
+            i += 1
+    
+    def _exists(self, key) -> bool:
+        return key in self._existingView
+
+    def _existing(self):
+        return self._iterable(self._existingView.values())
+    
+    def _refreshView(self, key):
+        if self._snapshots:
+            self._preserve(self._existingView, key)
+        previous = self._existingView.get(key)
+        latest = self._addIndex.get(key)
+        if latest is not None and not self._laterRemoveExists(latest) and not self._getTimestamp(latest) < self._clearedBefore:
+            self._existingView[key] = latest
+        else:
+            self._existingView.pop(key, None)
+        if self._digests is not None:
+            self._updateDigest(key, previous)
+    
+    def _precedes(self, entry, otherEntry) -> bool:
+        """Whether the entry loses against the other entry of its key, by timestamp and then by value (see Digests.precedes)."""
+        return precedes(self._getTimestamp(entry), entry[0], self._getTimestamp(otherEntry), otherEntry[0])
+    
+    def _existingAfterAdding(self, entries):
+        """Lookup keys of the entries whose values would exist after adding the entries. Adds never remove values."""
+        if not self._removeIndex and self._clearedBefore == -math.inf:
+            return set(map(self._lookupFunction, entries))
+        return {self._lookupFunction(entry) for entry in entries if self._exists(self._lookupFunction(entry))
+                or not (self._laterRemoveExists(entry) or self._getTimestamp(entry) < self._clearedBefore)}
     
     def _laterRemoveExists(self, entry):
-        value = self._lookupFunction(entry)
-        timestamp = self._getTimestamp(entry)
-        if not any(value == self._lookupFunction(removedValue) for removedValue in self._removeSet):
+        lastRemoved = self._removeIndex.get(self._lookupFunction(entry))
+        if lastRemoved is None:
             return False
         
-        lastRemoved = max(self._getTimestamp(e) for e in self._removeSet if value == self._lookupFunction(e))
-        
-        return timestamp < lastRemoved
+        return self._getTimestamp(entry) < lastRemoved
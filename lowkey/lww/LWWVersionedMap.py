@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+import itertools
+import math
+import uuid
+
+from lowkey.lww.Digests import precedes
+from lowkey.lww.HAMT import HAMT
+from lowkey.lww.Versioning import addContainer, notifyContainers
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Versioned LWWMap data type for keeping the history of maps, e.g., for reviewing and time-travel debugging.
+
+Provides the query and write interface of the LWWMap type (query, lookup, size, add, remove, addAll, removeAll,
+update and clear), and the state-based merge of versioned maps. Delta-state replication, compaction, and the key
+and entry views of LWWMap are not provided; versions take the place of snapshots. The latest (value, add
+timestamp, remove timestamp) record of every key is stored in a persistent hash array mapped trie, so that every
+write produces a new version of the map in O(log n), sharing the unchanged nodes of the trie with the previous version.
+
+As in LWWColumnarSet, clearing the map does not walk the trie: it resets the size if every value is added before
+the range tombstone, and otherwise leaves the size of the version to be recounted on the first request.
+
+Versions are read-only and stay readable as long as they are referenced. The map does not keep its past
+versions alive: they are freed once no longer referenced.
+
+Changes of the map increment the versions of the structures containing it (see Versioning).
+"""
+
+
+class LWWMapVersion():
+    """Read-only version of an LWWVersionedMap."""
+    
+    __slots__ = ('_records', '_clearedBefore', '_size', '_latestAddTimestamp', '_number')
+    
+    def __init__(self, records:HAMT, clearedBefore, size, latestAddTimestamp, number:int):
+        self._records = records  # key -> (value, add timestamp, remove timestamp)
+        self._clearedBefore = clearedBefore
+        self._size = size  # None if to be recounted
+        self._latestAddTimestamp = latestAddTimestamp
+        self._number = number
+    
+    def __iter__(self):
+        for key, record in self._records:
+            if self._exists(record):
+                yield ((key, record[0]), record[1])
+    
+    def getNumber(self) -> int:
+        return self._number
+    
+    def query(self, key):
+        record = self._records.get(key)
+        return record[0] if record is not None and self._exists(record) else None
+    
+    def lookup(self, key) -> bool:
+        record = self._records.get(key)
+        return record is not None and self._exists(record)
+    
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(1 for _record in self)
+        return self._size
+    
+    def _exists(self, record) -> bool:
+        _, addTimestamp, removeTimestamp = record
+        return not addTimestamp < removeTimestamp and not addTimestamp < self._clearedBefore
+
+
+class LWWVersionedMap():
+    
+    def __init__(self):
+        self._current = LWWMapVersion(HAMT(), -math.inf, 0, -math.inf, 0)
+        self._containers = None  # structures containing this map (see Versioning.addContainer)
+        self._id = uuid.uuid1()
+    
+    def __iter__(self):
+        yield from self._current
+    
+    """Versions"""
+    
+    def getVersion(self) -> int:
+        return self._current._number
+    
+    def changedSince(self, version: int) -> bool:
+        return self._current._number > version
+    
+    def currentVersion(self) -> LWWMapVersion:
+        return self._current
+    
+    def revert(self, version:LWWMapVersion):
+        """Makes the state of an earlier version the current state, as a new version."""
+        self._setCurrent(LWWMapVersion(version._records, version._clearedBefore, version._size, version._latestAddTimestamp,
+                                       self._current._number + 1))
+    
+    """Interface methods"""
+    
+    def getId(self):
+        return self._id
+    
+    def query(self, key):
+        return self._current.query(key)
+    
+    def lookup(self, key) -> bool:
+        return self._current.lookup(key)
+    
+    def size(self) -> int:
+        return self._current.size()
+    
+    def add(self, key=None, value=None, timestamp: int=0) -> bool:
+        record = self._current._records.get(key)
+        if record is not None and not precedes(record[1], record[0], timestamp, value):  # LWW, ties broken by the values
+            return record[1] == timestamp and record[0] == value  # already known
+        
+        self._commit(key, (value, timestamp, record[2] if record else -math.inf), record)
+        return True
+    
+    def remove(self, key, timestamp: int) -> bool:
+        record = self._current._records.get(key)
+        if record is not None and timestamp < record[2]:  # LWW
+            return False
+        
+        self._commit(key, (record[0], record[1], timestamp) if record else (None, -math.inf, timestamp), record)
+        return True
+    
+    def addAll(self, keys, values, timestamps):
+        for key, value, timestamp in zip(keys, values, self._timestampsOf(timestamps)):
+            self.add(key, value, timestamp)
+    
+    def removeAll(self, keys, timestamps):
+        for key, timestamp in zip(keys, self._timestampsOf(timestamps)):
+            self.remove(key, timestamp)
+    
+    def update(self, key, newValue, timestamp):
+        self.remove(key, timestamp)  # at the same timestamp, as adds win ties against removes
+        self.add(key, newValue, timestamp)
+    
+    def clear(self, timestamp: int):
+        """Removes every value added before the timestamp by raising the range tombstone of the map."""
+        current = self._current
+        if not timestamp > current._clearedBefore:  # LWW
+            return
+        
+        size = 0 if current._latestAddTimestamp < timestamp else None  # recounted on demand
+        self._setCurrent(LWWMapVersion(current._records, timestamp, size, current._latestAddTimestamp, current._number + 1))
+    
+    def merge(self, other):
+        """State-based merge with another LWWVersionedMap."""
+        for key, (value, addTimestamp, removeTimestamp) in other._current._records:
+            if addTimestamp != -math.inf:
+                self.add(key, value, addTimestamp)
+            if removeTimestamp != -math.inf:
+                self.remove(key, removeTimestamp)
+        self.clear(other._current._clearedBefore)
+    
+    """ Internal methods """
+    
+    def _commit(self, key, record, previousRecord):
+        current = self._current
+        size = current._size
+        if size is not None:
+            size += current._exists(record) - (previousRecord is not None and current._exists(previousRecord))
+        latestAddTimestamp = max(current._latestAddTimestamp, record[1])
+        self._setCurrent(LWWMapVersion(current._records.set(key, record), current._clearedBefore, size, latestAddTimestamp,
+                                       current._number + 1))
+    
+    def _setCurrent(self, version):
+        self._current = version
+        if self._containers:
+            notifyContainers(self._containers, {id(self)})
+    
+    def _addContainer(self, container):
+        self._containers = addContainer(self._containers, container)
+    
+    def _timestampsOf(self, timestamps):
+        return itertools.repeat(timestamps) if isinstance(timestamps, int) else timestamps
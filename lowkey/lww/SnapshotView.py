@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+from collections.abc import Mapping
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Read-only view of a dictionary as it was when a snapshot was taken.
+
+The view shares the dictionary with its owner, which keeps writing it. Before writing a key, the owner preserves
+the value of the key in the overlay of the view (or ABSENT if the key did not exist), once per key, so that a write
+costs constant time regardless of the size of the dictionary. Reads of the view prefer the overlay.
+
+Views can be read while their owner is being written by another thread: single reads consult the dictionary first and
+the overlay second, and iterations copy the dictionary first and the overlay second, while the owner preserves a key in
+the overlay before writing it in the dictionary.
+"""
+
+ABSENT = object()  # value of the keys that did not exist when the snapshot was taken
+
+
+class SnapshotView(Mapping):
+    
+    __slots__ = ('_live', '_overlay', '_size')
+    
+    def __init__(self, live:dict):
+        self._live = live
+        self._overlay = dict()  # key -> value when the snapshot was taken, for the keys written since
+        self._size = len(live)
+    
+    def __getitem__(self, key):
+        value = self.get(key, ABSENT)
+        if value is ABSENT:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key):
+        return self.get(key, ABSENT) is not ABSENT
+    
+    def __len__(self):
+        return self._size
+    
+    def __iter__(self):
+        return iter([key for key, _value in self.items()])
+    
+    """Interface methods"""
+    
+    def get(self, key, default=None):
+        value = self._live.get(key, ABSENT)
+        value = self._overlay.get(key, value)
+        return default if value is ABSENT else value
+    
+    def items(self):
+        """Returns the (key, value) items in a list, in the order of the dictionary, except for the written keys."""
+        liveItems = tuple(self._live.items())
+        overlay = self._overlay.copy()
+        items = [item for item in liveItems if item[0] not in overlay]
+        items += [item for item in overlay.items() if item[1] is not ABSENT]
+        return items
+    
+    def values(self):
+        return [value for _key, value in self.items()]
+    
+    def preserve(self, key):
+        """Preserves the value of the key before it is written in the dictionary."""
+        if key not in self._overlay:
+            self._overlay[key] = self._live.get(key, ABSENT)
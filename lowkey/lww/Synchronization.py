@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+import functools
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Synchronization of the data types in thread-safe mode.
+
+Objects in thread-safe mode hold a reentrant lock in their _lock attribute (None otherwise). Writes are
+serialized by the lock. Reads returning the changes since a version or a timestamp, and the neighbourhood
+queries of graphs, take it too, and collect their result holding it, as their cost is proportional to the result. Other reads do not take it: they either
+read a single entry, or iterate over a copy of a container or over a snapshot of the object, which writers
+do not modify.
+"""
+
+
+def synchronized(method):
+    """Runs the method holding the lock of its object, if the object is in thread-safe mode."""
+
+    @functools.wraps(method)
+    def synchronizedMethod(self, *args, **kwargs):
+        lock = self._lock
+        if lock is None:
+            return method(self, *args, **kwargs)
+        with lock:
+            return method(self, *args, **kwargs)
+
+    return synchronizedMethod
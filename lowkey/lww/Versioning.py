@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+import weakref
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Propagation of local versions from nested structures to their containers.
+
+Structures stored in the values of other structures, directly or in tuples, keep weak references to their
+containers: a single weak reference, as structures are typically stored in one container, and a weak dictionary
+by ids once a second container registers. Every change of a structure increments the local versions of its containers, transitively, so
+that whether anything under a structure changed since a version is a single comparison of its local version.
+Containers are notified once per change, even if they contain each other.
+
+Containers are not unregistered when the nested structure is removed from them, so they may be notified about
+changes of structures they no longer contain.
+"""
+
+
+def registerNested(value, container):
+    """Registers the container of the structures in the value."""
+    if isinstance(value, tuple):
+        for element in value:
+            if isinstance(element, tuple) or hasattr(element, '_addContainer'):
+                registerNested(element, container)
+    elif value is not container and hasattr(value, '_addContainer'):
+        value._addContainer(container)
+
+
+def addContainer(containers, container):
+    """Returns the containers (None, a weak reference, or a weak dictionary by ids) extended by the container."""
+    if containers is None:
+        return weakref.ref(container)
+    if isinstance(containers, weakref.ref):
+        first = containers()
+        if first is None:
+            return weakref.ref(container)
+        if first is container:
+            return containers
+        containers = weakref.WeakValueDictionary({id(first): first})  # keyed by identity, as containers may be equal
+    containers[id(container)] = container
+    return containers
+
+
+def containersOf(containers):
+    """Returns the containers (see addContainer) that are still alive, in a list."""
+    if isinstance(containers, weakref.ref):
+        container = containers()
+        return [] if container is None else [container]
+    return list(containers.values())
+
+
+def notifyContainers(containers, visited):
+    """Increments the versions of the containers (see addContainer) not visited yet, transitively."""
+    for container in containersOf(containers):
+        if id(container) not in visited:
+            visited.add(id(container))
+            container._nestedChanged(visited)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+import argparse
+import json
+import math
+import platform
+import time
+
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWSet import LWWSet
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+"""
+Micro-benchmarks of the LWW data types, with scaling curves.
+
+Runs standalone, without network, and is not part of the unit tests:
+    python -m lowkey.lww.benchmarks.Benchmarks [--sizes 100 1000 10000 100000] [--repeat 3] [--output results.json]
+
+Every benchmark prepares a structure of n elements (untimed), then times n operations on it, or a single
+operation processing all n elements (e.g., iteration and merge). The best time of the repeated runs is reported.
+The results are emitted as JSON, together with the scaling exponent k of every benchmark, fitted as
+time ~ n^k by least squares on the log-log scale. Since n operations are timed, k = 1 means constant time per
+operation, and k = 2 means time linear in the size of the structure per operation.
+"""
+
+SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5]
+
+
+def filledSet(n):
+    lwwSet = LWWSet()
+    lwwSet.addAll(range(n), 1)
+    return lwwSet
+
+
+def filledMap(n):
+    lwwMap = LWWMap()
+    lwwMap.addAll(range(n), range(n), 1)
+    return lwwMap
+
+
+def divergedReplicas(n):
+    """
+    Two replicas of n values each, sharing half of them. The shared values are added again on the second replica,
+    and every other one of them is removed later on the first, so that merging resolves conflicts of both kinds.
+    """
+    lwwSet = filledSet(n)
+    other = LWWSet()
+    other.addAll(range(n // 2, n + n // 2), 2)
+    for i in range(n // 2, n, 2):
+        lwwSet.remove(i, 3)
+    for i in range(n, n + n // 2, 2):
+        other.remove(i, 3)
+    return lwwSet, other
+
+
+def chainGraph(n):
+    graph = LWWGraph()
+    for i in range(n):
+        graph.addVertex(i, 1)
+    for i in range(n - 1):
+        graph.addEdgeWithName(i, i, i + 1, 2)
+    return graph
+
+
+def setAdd(lwwSet, n):
+    for i in range(n):
+        lwwSet.add(i, 2)
+
+
+def setRemove(lwwSet, n):
+    for i in range(n):
+        lwwSet.remove(i, 2)
+
+
+def setLookup(lwwSet, n):
+    for i in range(n):
+        lwwSet.lookup(i)
+
+
+def setSize(lwwSet, n):
+    for _ in range(n):
+        lwwSet.size()
+
+
+def setIterate(lwwSet, n):
+    for _ in lwwSet:
+        pass
+
+
+def setMerge(sets, n):
+    lwwSet, other = sets
+    lwwSet.merge(other)
+
+
+def mapQuery(lwwMap, n):
+    for i in range(n):
+        lwwMap.query(i)
+
+
+def mapUpdate(lwwMap, n):
+    for i in range(n):
+        lwwMap.update(i, -i, 2)
+
+
+def graphAddVertex(graph, n):
+    for i in range(n):
+        graph.addVertex(i, 1)
+
+
+def graphAddEdge(graph, n):
+    for i in range(n - 1):
+        graph.addEdgeWithName(i, i, i + 1, 2)
+
+
+def graphAdjacency(graph, n):
+    for i in range(n):
+        graph.getAdjacencyListForVertex(i)
+
+
+def graphTraversal(graph, n):
+    for _ in graph.breadthFirstSearch(0):
+        pass
+
+
+def graphImport(graph, n):
+    graph.importGraph(range(n), ((i, i, i + 1) for i in range(n - 1)), 1)
+
+
+def vertices(n):
+    graph = LWWGraph()
+    graphAddVertex(graph, n)
+    return graph
+
+
+BENCHMARKS = {  # name -> (setup, timed operation)
+    'set.add': (lambda n: LWWSet(), setAdd),
+    'set.remove': (filledSet, setRemove),
+    'set.lookup': (filledSet, setLookup),
+    'set.size': (filledSet, setSize),
+    'set.iterate': (filledSet, setIterate),
+    'set.merge': (divergedReplicas, setMerge),
+    'map.query': (filledMap, mapQuery),
+    'map.update': (filledMap, mapUpdate),
+    'graph.addVertex': (lambda n: LWWGraph(), graphAddVertex),
+    'graph.addEdgeWithName': (vertices, graphAddEdge),
+    'graph.importGraph': (lambda n: LWWGraph(), graphImport),
+    'graph.getAdjacencyListForVertex': (chainGraph, graphAdjacency),
+    'graph.breadthFirstSearch': (chainGraph, graphTraversal),
+}
+
+
+def measure(setup, operation, n, repeat):
+    """Best time of the operation in seconds, out of the repeated runs."""
+    best = math.inf
+    for _ in range(repeat):
+        state = setup(n)
+        start = time.perf_counter()
+        operation(state, n)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scalingExponent(sizes, seconds):
+    """Slope of the least-squares line fitted to the (log n, log time) points."""
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in seconds]
+    meanX = sum(xs) / len(xs)
+    meanY = sum(ys) / len(ys)
+    variance = sum((x - meanX) ** 2 for x in xs)
+    if variance == 0:
+        return None
+    return sum((x - meanX) * (y - meanY) for x, y in zip(xs, ys)) / variance
+
+
+def run(names, sizes, repeat):
+    results = {}
+    for name in names:
+        setup, operation = BENCHMARKS[name]
+        seconds = [measure(setup, operation, n, repeat) for n in sizes]
+        results[name] = {
+            'seconds': dict(zip(map(str, sizes), seconds)),
+            'secondsPerElement': {str(n): t / n for n, t in zip(sizes, seconds)},
+            'exponent': scalingExponent(sizes, seconds)
+        }
+    return {'python': platform.python_version(), 'sizes': sizes, 'repeat': repeat, 'benchmarks': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the LWW data types.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--output', help="JSON file to write the results to, instead of the standard output")
+    args = parser.parse_args()
+
+    results = json.dumps(run(args.only, args.sizes, args.repeat), indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(results)
+    else:
+        print(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWSet import LWWSet
+from lowkey.lww.LWWVertex import LWWVertex
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class ChangeQueryTests(unittest.TestCase):
+
+    def testSetChangesInTimestampOrder(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 30)
+        lwwSet.add("element2", 10)
+        lwwSet.remove("element2", 40)
+        lwwSet.add("element3", 20)
+        
+        self.assertEqual(list(lwwSet.changesSince(0)),
+                         [(False, ("element2", 10)), (False, ("element3", 20)), (False, ("element1", 30)), (True, ("element2", 40))])
+        self.assertEqual(list(lwwSet.changesSince(20)), [(False, ("element1", 30)), (True, ("element2", 40))])
+        self.assertEqual(list(lwwSet.changesBetween(10, 30)), [(False, ("element3", 20)), (False, ("element1", 30))])
+        self.assertEqual(list(lwwSet.changesSince(40)), [])
+    
+    def testChangesAfterQueryInTimestampOrder(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 30)
+        self.assertEqual(list(lwwSet.changesSince(0)), [(False, ("element1", 30))])
+        
+        lwwSet.add("element2", 40)
+        lwwSet.add("element3", 10)
+        lwwSet.remove("element3", 20)
+        
+        self.assertEqual(list(lwwSet.changesSince(0)),
+                         [(False, ("element3", 10)), (True, ("element3", 20)), (False, ("element1", 30)), (False, ("element2", 40))])
+    
+    def testOutOfOrderChangesBetweenQueriesInTimestampOrder(self):
+        lwwSet = LWWSet()
+        for i in range(1, 3001):
+            lwwSet.add(i, 2 * i)
+        self.assertEqual(len(list(lwwSet.changesSince(0))), 3000)
+        
+        expected = [(2 * i, (False, (i, 2 * i))) for i in range(1, 3001)]
+        for i in range(1, 3001):  # out of order, kept aside and merged into the timeline in turns
+            lwwSet.add(-i, 2 * i - 1)
+            expected.append((2 * i - 1, (False, (-i, 2 * i - 1))))
+            if i % 500 == 0:
+                self.assertEqual(list(lwwSet.changesBetween(i, 2 * i)), [change for timestamp, change in sorted(expected)
+                                                                         if i < timestamp <= 2 * i])
+        
+        self.assertEqual(list(lwwSet.changesSince(0)), [change for _timestamp, change in sorted(expected)])
+    
+    def testRejectedChangesAreNotListed(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 30)
+        lwwSet.add("element1", 10)
+        lwwSet.add("element1", 30)
+        
+        self.assertEqual(list(lwwSet.changesSince(0)), [(False, ("element1", 30))])
+    
+    def testMapChanges(self):
+        lwwMap = LWWMap()
+        
+        lwwMap.add("name", "Istvan", 10)
+        lwwMap.update("name", "David", 20)
+        
+        self.assertEqual(list(lwwMap.changesSince(10)), [(True, (("name", "Istvan"), 20)), (False, (("name", "David"), 20))])
+    
+    def testCompactedChangesAreNotListed(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 10)
+        lwwSet.add("element1", 20)
+        lwwSet.add("element2", 30)
+        lwwSet.compact(25)
+        
+        self.assertEqual(list(lwwSet.changesSince(0)), [(False, ("element1", 20)), (False, ("element2", 30))])
+    
+    def testGraphChanges(self):
+        lwwGraph = LWWGraph()
+        v1 = LWWVertex()
+        v2 = LWWVertex()
+        
+        lwwGraph.addVertex(v1, 10)
+        lwwGraph.add("name", "graph", 15)
+        lwwGraph.addVertex(v2, 20)
+        lwwGraph.addEdgeWithName("edgeAtoB", v1, v2, 30)
+        
+        changes = list(lwwGraph.changesSince(10))
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(changes[0], (False, (("name", "graph"), 15)))
+        self.assertEqual(changes[1], (False, (v2, 20)))
+        self.assertEqual(changes[2][1][1], 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.CausalStability import CausalStability
+from lowkey.lww.LWWEdge import LWWEdge
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWSet import LWWSet
+from lowkey.lww.LWWVertex import LWWVertex
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class CompactionTests(unittest.TestCase):
+
+    def testCompactSetKeepsState(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 10)
+        lwwSet.add("element1", 20)
+        lwwSet.add("element2", 30)
+        lwwSet.remove("element2", 40)
+        lwwSet.remove("element1", 15)
+        
+        lwwSet.compact(100)
+        
+        self.assertEqual(len(lwwSet._addSet), 1)
+        self.assertEqual(len(lwwSet._removeSet), 0)
+        self.assertTrue(lwwSet.lookup("element1"))
+        self.assertFalse(lwwSet.lookup("element2"))
+        self.assertEqual(lwwSet.size(), 1)
+        
+        lwwSet.add("element2", 110)
+        self.assertTrue(lwwSet.lookup("element2"))
+        
+    def testCompactKeepsEntriesNewerThanWatermark(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 10)
+        lwwSet.add("element1", 20)
+        lwwSet.remove("element1", 30)
+        
+        lwwSet.compact(25)
+        
+        self.assertEqual(len(lwwSet._addSet), 1)
+        self.assertEqual(len(lwwSet._removeSet), 1)
+        self.assertFalse(lwwSet.lookup("element1"))
+        
+        lwwSet.add("element1", 27)
+        self.assertFalse(lwwSet.lookup("element1"))
+        
+    def testCompactClearedSet(self):
+        lwwSet = LWWSet()
+        
+        for i in range(100):
+            lwwSet.add(i, i)
+        lwwSet.clear(50)
+        lwwSet.compact(30)
+        
+        self.assertEqual(len(lwwSet._addSet), 50)
+        self.assertEqual(lwwSet.size(), 50)
+        lwwSet.add(0, 40)
+        self.assertFalse(lwwSet.lookup(0))
+        
+    def testCompactMapDropsUpdateHistory(self):
+        lwwMap = LWWMap()
+        
+        lwwMap.add("name", "v0", 10)
+        for timestamp in range(20, 1000, 10):
+            lwwMap.update("name", "v{}".format(timestamp), timestamp)
+        
+        lwwMap.compact(1000)
+        
+        self.assertEqual(lwwMap.query("name"), "v990")
+        self.assertEqual(len(lwwMap._addSet), 1)
+        self.assertEqual(len(lwwMap._removeSet), 0)
+        
+    def testCompactGraph(self):
+        lwwGraph = LWWGraph()
+        
+        v1 = LWWVertex()
+        v1.add("name", "A", 1)
+        v1.update("name", "AA", 2)
+        v2 = LWWVertex()
+        v2.add("name", "B", 3)
+        
+        e1 = LWWEdge()
+        e1.add("name", "edgeAtoB", 4)
+        e1.add("from", v1, 4)
+        e1.add("to", v2, 4)
+        
+        lwwGraph.addVertex(v1, 10)
+        lwwGraph.addVertex(v2, 20)
+        lwwGraph.addEdge(e1, 30)
+        lwwGraph.removeEdge(e1, 40)
+        lwwGraph.removeVertex(v2, 50)
+        
+        lwwGraph.compact(100)
+        
+        self.assertTrue(lwwGraph.vertexExists(v1))
+        self.assertFalse(lwwGraph.vertexExists(v2))
+        self.assertFalse(lwwGraph.edgeExists(e1))
+        self.assertEqual(lwwGraph.numberOfVertices(), 1)
+        self.assertEqual(len(v1._removeSet), 0)
+        
+    def testCompactGraphOfPlainVertices(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.addVertex("v1", 10)
+        lwwGraph.addVertex(2, 10)
+        lwwGraph.addVertex("v3", 10)
+        lwwGraph.addEdgeWithName("edge", "v1", 2, 20)
+        lwwGraph.removeVertex("v3", 30)
+        
+        lwwGraph.compact(100)
+        
+        self.assertTrue(lwwGraph.vertexExists("v1"))
+        self.assertFalse(lwwGraph.vertexExists("v3"))
+        self.assertTrue(lwwGraph.edgeExistsWithName("edge"))
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("v1"), [2])
+        
+    def testStabilityWatermark(self):
+        stability = CausalStability()
+        self.assertIsNone(stability.getWatermark())
+        
+        stability.acknowledge("replica1", 30)
+        stability.acknowledge("replica2", 20)
+        self.assertEqual(stability.getWatermark(), 20)
+        
+        stability.acknowledge("replica2", 10)
+        self.assertEqual(stability.getWatermark(), 20)
+        
+        stability.acknowledge("replica2", 40)
+        self.assertEqual(stability.getWatermark(), 30)
+        
+        stability.removeReplica("replica1")
+        self.assertEqual(stability.getWatermark(), 40)
+        
+    def testCompactByStability(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        lwwSet.remove("element1", 20)
+        
+        stability = CausalStability()
+        stability.compact(lwwSet)
+        self.assertEqual(len(lwwSet._removeSet), 1)
+        
+        stability.acknowledge("replica1", 30)
+        stability.compact(lwwSet)
+        self.assertEqual(len(lwwSet._addSet), 0)
+        self.assertEqual(len(lwwSet._removeSet), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
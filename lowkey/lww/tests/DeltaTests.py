@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWRegister import LWWRegister
+from lowkey.lww.LWWSet import LWWSet
+from lowkey.lww.LWWVertex import LWWVertex
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class DeltaTests(unittest.TestCase):
+
+    def testVersionIncreasesWithAcceptedChanges(self):
+        lwwSet = LWWSet()
+        self.assertEqual(lwwSet.getVersion(), 0)
+        
+        lwwSet.add("element1", 20)
+        self.assertEqual(lwwSet.getVersion(), 1)
+        
+        lwwSet.add("element1", 10)
+        self.assertEqual(lwwSet.getVersion(), 1)
+        
+        lwwSet.remove("element1", 30)
+        self.assertEqual(lwwSet.getVersion(), 2)
+    
+    def testSetDeltas(self):
+        replicaA = LWWSet()
+        replicaB = LWWSet()
+        
+        replicaA.add("element1", 10)
+        replicaA.add("element2", 20)
+        replicaB.applyDelta(replicaA.deltaSince(0))
+        version = replicaA.getVersion()
+        
+        replicaA.remove("element1", 30)
+        replicaA.add("element3", 40)
+        delta = replicaA.deltaSince(version)
+        self.assertEqual(delta, ((("element3", 40),), (("element1", 30),), None))
+        
+        replicaB.applyDelta(delta)
+        self.assertFalse(replicaB.lookup("element1"))
+        self.assertTrue(replicaB.lookup("element2"))
+        self.assertTrue(replicaB.lookup("element3"))
+        
+        self.assertEqual(replicaA.deltaSince(replicaA.getVersion()), ((), (), None))
+        
+    def testApplyingKnownDeltaKeepsVersion(self):
+        replicaA = LWWMap()
+        replicaB = LWWMap()
+        replicaA.add("key1", "value1", 10)
+        replicaA.update("key1", "value2", 20)
+        replicaB.applyDelta(replicaA.deltaSince(0))
+        version = replicaB.getVersion()
+        
+        replicaB.applyDelta(replicaA.deltaSince(0))
+        replicaA.applyDelta(replicaB.deltaSince(0))
+        
+        self.assertEqual(replicaB.getVersion(), version)
+        self.assertEqual(replicaA.getVersion(), version)
+        
+    def testClearIsPropagated(self):
+        replicaA = LWWSet()
+        replicaB = LWWSet()
+        
+        replicaA.add("element1", 10)
+        replicaB.add("element2", 20)
+        replicaB.add("element3", 40)
+        version = replicaA.getVersion()
+        replicaA.clear(30)
+        
+        self.assertEqual(replicaA.deltaSince(version), ((), (), 30))
+        replicaB.applyDelta(replicaA.deltaSince(version))
+        self.assertFalse(replicaB.lookup("element2"))
+        self.assertTrue(replicaB.lookup("element3"))
+        
+        replicaA.merge(replicaB)
+        self.assertEqual(replicaA.size(), 1)
+        
+    def testMapDeltas(self):
+        replicaA = LWWMap()
+        replicaB = LWWMap()
+        
+        replicaA.add("name", "Istvan", 10)
+        replicaB.applyDelta(replicaA.deltaSince(0))
+        version = replicaA.getVersion()
+        
+        replicaA.update("name", "David", 20)
+        replicaB.applyDelta(replicaA.deltaSince(version))
+        self.assertEqual(replicaB.query("name"), "David")
+        
+    def testRegisterDeltas(self):
+        replicaA = LWWRegister()
+        replicaB = LWWRegister(prototype=replicaA)
+        self.assertIsNone(replicaA.deltaSince(0))
+        
+        replicaA.update("value", 10)
+        replicaB.applyDelta(replicaA.deltaSince(0))
+        self.assertEqual(replicaB.query(), "value")
+        self.assertIsNone(replicaA.deltaSince(replicaA.getVersion()))
+    
+    def testGraphDeltas(self):
+        v1 = LWWVertex()
+        v2 = LWWVertex()
+        
+        replicaA = LWWGraph()
+        replicaB = LWWGraph()
+        
+        replicaA.addVertex(v1, 10)
+        replicaA.addVertex(v2, 20)
+        replicaB.applyDelta(replicaA.deltaSince(0))
+        self.assertEqual(replicaB.numberOfVertices(), 2)
+        version = replicaA.getVersion()
+        self.assertEqual(version, 2)
+        
+        replicaA.addEdgeWithName("edgeAtoB", v1, v2, 30)
+        replicaB.applyDelta(replicaA.deltaSince(version))
+        self.assertTrue(replicaB.edgeExistsWithName("edgeAtoB"))
+        self.assertEqual(replicaB.getAdjacencyListForVertex(v1), [v2])
+        version = replicaA.getVersion()
+        
+        replicaA.removeEdgeByName("edgeAtoB", 40)
+        replicaB.applyDelta(replicaA.deltaSince(version))
+        self.assertFalse(replicaB.edgeExistsWithName("edgeAtoB"))
+        self.assertEqual(replicaB.getAdjacencyListForVertex(v1), [])
+        
+    def testCompactedEntriesLeaveDeltas(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        lwwSet.remove("element1", 20)
+        
+        lwwSet.compact(30)
+        self.assertEqual(lwwSet.deltaSince(0), ((), (), None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+import copy
+import unittest
+
+from lowkey.lww.Digests import bucketOf
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWSet import LWWSet
+from lowkey.lww.LWWVertex import LWWVertex
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class DigestTests(unittest.TestCase):
+    
+    def testReplicasWithSameStateHaveSameDigest(self):
+        replica1 = LWWSet()
+        replica1.add("element1", 10)
+        replica1.add("element2", 20)
+        replica1.remove("element1", 30)
+        replica2 = LWWSet()
+        replica2.remove("element1", 30)
+        replica2.add("element2", 20)
+        replica2.add("element1", 10)
+        
+        self.assertEqual(replica1.digest(), replica2.digest())
+        self.assertEqual(replica1.differingBuckets(replica2.bucketDigests()), [])
+    
+    def testDigestIsUpdatedIncrementally(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        emptyDigest = LWWSet().digest()
+        digest = lwwSet.digest()
+        
+        lwwSet.add("element2", 20)
+        lwwSet.remove("element2", 30)
+        lwwSet.add("element2", 40)
+        
+        self.assertNotEqual(lwwSet.digest(), digest)
+        self.assertNotEqual(lwwSet.digest(), emptyDigest)
+        self.assertEqual(lwwSet.bucketDigests(), tuple(lwwSet._buildDigests()))
+    
+    def testDifferingBucketsOfDivergentReplicas(self):
+        replica1 = LWWSet()
+        replica1.addAll(range(100), 10)
+        replica2 = copy.deepcopy(replica1)
+        replica2.add(1000, 20)
+        replica2.remove(5, 20)
+        
+        differing = replica1.differingBuckets(replica2.bucketDigests())
+        
+        self.assertEqual(set(differing), {bucketOf(1000), bucketOf(5)})
+    
+    def testResyncDifferingBuckets(self):
+        replica1 = LWWSet()
+        replica1.addAll(range(100), 10)
+        replica2 = copy.deepcopy(replica1)
+        replica2.add(1000, 20)
+        replica2.remove(5, 20)
+        
+        delta = replica2.deltaOfBuckets(replica1.differingBuckets(replica2.bucketDigests()))
+        replica1.applyDelta(delta)
+        
+        self.assertEqual(replica1.digest(), replica2.digest())
+        self.assertTrue(replica1.lookup(1000))
+        self.assertFalse(replica1.lookup(5))
+        self.assertLess(len(delta[0]) + len(delta[1]), 100)
+    
+    def testClearChangesDigestsOfClearedValues(self):
+        replica1 = LWWSet()
+        replica1.add("element", 10)
+        replica2 = copy.deepcopy(replica1)
+        
+        replica2.clear(20)
+        
+        self.assertNotEqual(replica1.digest(), replica2.digest())
+        self.assertEqual(replica1.differingBuckets(replica2.bucketDigests()), [bucketOf("element")])
+        self.assertEqual(replica2.bucketDigests(), tuple(replica2._buildDigests()))
+        replica1.applyDelta(replica2.deltaOfBuckets([]))
+        self.assertEqual(replica1.digest(), replica2.digest())
+    
+    def testCompactionKeepsDigests(self):
+        replica1 = LWWMap()
+        replica1.add("key1", "value1", 10)
+        replica1.update("key1", "value2", 20)
+        replica1.add("key2", "value1", 10)
+        replica1.remove("key2", 30)
+        replica1.add("key3", "value1", 10)
+        replica1.clear(15)
+        replica2 = copy.deepcopy(replica1)
+        replica3 = copy.deepcopy(replica1)
+        digest = replica1.digest()
+        
+        replica2.compact(25)
+        replica3.compact(40)
+        
+        self.assertEqual(replica2.digest(), digest)
+        self.assertEqual(replica3.digest(), digest)
+        self.assertEqual(replica2.differingBuckets(replica3.bucketDigests()), [])
+        self.assertEqual(replica3.bucketDigests(), tuple(replica3._buildDigests()))
+        self.assertEqual(replica3.deltaOfBuckets(replica1.differingBuckets(replica3.bucketDigests())), ((), (), 15))
+    
+    def testMapValuesAreDigested(self):
+        replica1 = LWWMap()
+        replica1.add("key", "value1", 10)
+        replica2 = LWWMap()
+        replica2.add("key", "value2", 10)
+        
+        self.assertEqual(replica1.differingBuckets(replica2.bucketDigests()), [bucketOf("key")])
+        
+        replica2.update("key", "value3", 20)
+        replica1.applyDelta(replica2.deltaOfBuckets(replica1.differingBuckets(replica2.bucketDigests())))
+        
+        self.assertEqual(replica1.digest(), replica2.digest())
+        self.assertEqual(replica1.query("key"), "value3")
+    
+    def testSnapshotDigestIsIsolated(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        lwwSet.digest()
+        snapshot = lwwSet.snapshot()
+        digest = snapshot.digest()
+        
+        lwwSet.add("element2", 20)
+        
+        self.assertEqual(snapshot.digest(), digest)
+        self.assertNotEqual(lwwSet.digest(), digest)
+    
+    def testGraphResync(self):
+        replica1 = LWWGraph()
+        vertex1 = LWWVertex()
+        vertex2 = LWWVertex()
+        replica1.addVertex(vertex1, 10)
+        replica1.addVertex(vertex2, 10)
+        replica2 = copy.deepcopy(replica1)
+        vertices = [vertex for vertex, _timestamp in replica2.exportVertices()]
+        replica2.addEdgeWithName("edge", vertices[0], vertices[1], 20)
+        
+        mapBuckets, vertexBuckets, edgeBuckets = replica1.differingBuckets(replica2.bucketDigests())
+        self.assertEqual((mapBuckets, vertexBuckets, len(edgeBuckets)), ([], [], 1))
+        
+        replica1.applyDelta(replica2.deltaOfBuckets((mapBuckets, vertexBuckets, edgeBuckets)))
+        
+        self.assertEqual(replica1.digest(), replica2.digest())
+        self.assertTrue(replica1.edgeExistsWithName("edge"))
+
+
+if __name__ == "__main__":
+    unittest.main()
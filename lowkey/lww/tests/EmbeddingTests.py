@@ -53,6 +53,17 @@ class EmbeddingTests(unittest.TestCase):
         
         self.assertTrue(base.lookup(embedded))
         
+    def testUpdateRegisterEmbeddedInSet(self):
+        base = LWWSet()
+        embedded = LWWRegister()
+        
+        embedded.update("element1", 10)
+        base.add(embedded, 20)
+        embedded.update("element2", 30)
+        
+        self.assertTrue(base.lookup(embedded))
+        self.assertTrue(base.lookup(LWWRegister(prototype=embedded)))
+        
     def testEmbedSetInSet(self):
         base = LWWSet()
         embedded = LWWSet()
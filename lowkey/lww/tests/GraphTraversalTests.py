@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.LWWGraph import LWWGraph
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class GraphTraversalTests(unittest.TestCase):
+    
+    def setUp(self):
+        """A -> B -> D, A -> C -> D, E -> F, and the isolated G."""
+        self._graph = LWWGraph()
+        for vertex in "ABCDEFG":
+            self._graph.addVertex(vertex, 10)
+        for source, destination in ["AB", "AC", "BD", "CD", "EF"]:
+            self._graph.addEdgeWithName(source + destination, source, destination, 20)
+    
+    def testBreadthFirstSearch(self):
+        self.assertEqual(list(self._graph.breadthFirstSearch("A")), ["A", "B", "C", "D"])
+        self.assertEqual(list(self._graph.breadthFirstSearch("D")), ["D"])
+        
+    def testDepthFirstSearch(self):
+        self.assertEqual(list(self._graph.depthFirstSearch("A")), ["A", "B", "D", "C"])
+        
+    def testEarlyTermination(self):
+        traversal = self._graph.breadthFirstSearch("A")
+        self.assertEqual(next(traversal), "A")
+        self.assertEqual(next(traversal), "B")
+        
+    def testReachability(self):
+        self.assertTrue(self._graph.isReachable("A", "D"))
+        self.assertFalse(self._graph.isReachable("D", "A"))
+        self.assertFalse(self._graph.isReachable("A", "E"))
+        
+        self._graph.removeEdgeByName("BD", 30)
+        self._graph.removeEdgeByName("CD", 30)
+        self.assertFalse(self._graph.isReachable("A", "D"))
+        
+    def testTopologicalOrder(self):
+        order = list(self._graph.topologicalOrder())
+        
+        self.assertEqual(sorted(order), list("ABCDEFG"))
+        for source, destination in ["AB", "AC", "BD", "CD", "EF"]:
+            self.assertLess(order.index(source), order.index(destination))
+        
+    def testTopologicalOrderOfCycle(self):
+        self._graph.addEdgeWithName("DA", "D", "A", 30)
+        
+        self.assertRaises(Exception, list, self._graph.topologicalOrder())
+        
+    def testConnectedComponents(self):
+        components = list(self._graph.connectedComponents())
+        
+        self.assertEqual(len(components), 3)
+        self.assertTrue(set("ABCD") in components)
+        self.assertTrue(set("EF") in components)
+        self.assertTrue({"G"} in components)
+        
+    def testLargeGraph(self):
+        graph = LWWGraph()
+        n = 2000
+        for i in range(n):
+            graph.addVertex(i, 10)
+        for i in range(n - 1):
+            graph.addEdgeWithName(i, i, i + 1, 20)
+        
+        self.assertEqual(sum(1 for _ in graph.depthFirstSearch(0)), n)
+        self.assertEqual(next(graph.topologicalOrder()), 0)
+        self.assertEqual(len(next(graph.connectedComponents())), n)
+
+
+if __name__ == "__main__":
+    unittest.main()
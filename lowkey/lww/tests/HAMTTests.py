@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.HAMT import HAMT
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class CollidingKey():
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and self.name == other.name
+    
+    def __hash__(self):
+        return 42
+
+
+class HAMTTests(unittest.TestCase):
+
+    def testSetGetDelete(self):
+        trie = HAMT()
+        for i in range(1000):
+            trie = trie.set(i, str(i))
+        
+        self.assertEqual(len(trie), 1000)
+        self.assertEqual(trie.get(500), "500")
+        self.assertTrue(999 in trie)
+        self.assertFalse(1000 in trie)
+        
+        for i in range(0, 1000, 2):
+            trie = trie.delete(i)
+        
+        self.assertEqual(len(trie), 500)
+        self.assertEqual(trie.get(500), None)
+        self.assertEqual(trie.get(501), "501")
+        self.assertEqual(sorted(key for key, _ in trie), list(range(1, 1000, 2)))
+        
+    def testPersistence(self):
+        trie1 = HAMT().set("key1", "value1")
+        trie2 = trie1.set("key1", "value2").set("key2", "value3")
+        trie3 = trie2.delete("key1")
+        
+        self.assertEqual(trie1.get("key1"), "value1")
+        self.assertFalse("key2" in trie1)
+        self.assertEqual(trie2.get("key1"), "value2")
+        self.assertEqual(len(trie2), 2)
+        self.assertFalse("key1" in trie3)
+        self.assertEqual(len(trie3), 1)
+        
+    def testUnchangedWritesReturnSameTrie(self):
+        value = "value1"
+        trie = HAMT().set("key1", value)
+        
+        self.assertIs(trie.set("key1", value), trie)
+        self.assertIs(trie.delete("key2"), trie)
+        
+    def testCollisions(self):
+        keys = [CollidingKey(name) for name in "abc"]
+        trie = HAMT()
+        for key in keys:
+            trie = trie.set(key, key.name)
+        trie = trie.set(1, "one")
+        
+        self.assertEqual(len(trie), 4)
+        self.assertEqual([trie.get(key) for key in keys], ["a", "b", "c"])
+        
+        trie = trie.delete(keys[0]).delete(keys[1])
+        self.assertEqual(len(trie), 2)
+        self.assertEqual(trie.get(keys[2]), "c")
+        self.assertEqual(trie.get(keys[0]), None)
+        self.assertEqual(trie.get(1), "one")
+        
+        trie = trie.delete(keys[2]).delete(1)
+        self.assertEqual(len(trie), 0)
+        self.assertEqual(list(trie), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
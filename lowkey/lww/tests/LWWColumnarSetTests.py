@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.LWWColumnarSet import LWWColumnarSet
+from lowkey.lww.LWWSet import LWWSet
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class LWWColumnarSetTests(unittest.TestCase):
+
+    def testAddRemoveAdd(self):
+        lwwSet = LWWColumnarSet()
+        self.assertEqual(lwwSet.size(), 0)
+        self.assertFalse(lwwSet.lookup("element1"))
+        
+        lwwSet.add("element1", 10)
+        self.assertTrue(lwwSet.lookup("element1"))
+        self.assertEqual(lwwSet.size(), 1)
+        
+        lwwSet.remove("element1", 20)
+        self.assertFalse(lwwSet.lookup("element1"))
+        self.assertEqual(lwwSet.size(), 0)
+        
+        lwwSet.add("element1", 30)
+        self.assertTrue(lwwSet.lookup("element1"))
+        self.assertEqual(lwwSet.size(), 1)
+        
+    def testDelayedOperations(self):
+        lwwSet = LWWColumnarSet()
+        
+        lwwSet.add(1, 30)
+        self.assertFalse(lwwSet.add(1, 10))
+        lwwSet.remove(1, 20)
+        self.assertTrue(lwwSet.lookup(1))
+        
+        lwwSet.remove(2, 20)
+        lwwSet.add(2, 10)
+        self.assertFalse(lwwSet.lookup(2))
+        self.assertEqual(lwwSet.size(), 1)
+        
+    def testIterationAndClear(self):
+        lwwSet = LWWColumnarSet()
+        
+        for i in range(100):
+            lwwSet.add(i, i)
+        lwwSet.remove(50, 100)
+        
+        self.assertEqual(len([e for e in lwwSet]), 99)
+        self.assertTrue((10, 10) in [e for e in lwwSet])
+        
+        lwwSet.clear(200)
+        self.assertEqual(lwwSet.size(), 0)
+        self.assertEqual([e for e in lwwSet], [])
+        
+    def testBulkOperations(self):
+        lwwSet = LWWColumnarSet()
+        
+        lwwSet.addAll(range(1000), range(1000))
+        lwwSet.removeAll(range(0, 1000, 2), 500)
+        self.assertEqual(lwwSet.size(), 750)
+        self.assertFalse(lwwSet.lookup(0))
+        self.assertTrue(lwwSet.lookup(500))
+        
+    def testClearRemovesOlderValuesOnly(self):
+        lwwSet = LWWColumnarSet()
+        
+        lwwSet.add("element1", 10)
+        lwwSet.add("element2", 30)
+        lwwSet.clear(20)
+        self.assertFalse(lwwSet.lookup("element1"))
+        self.assertTrue(lwwSet.lookup("element2"))
+        self.assertEqual(lwwSet.size(), 1)
+        
+        lwwSet.add("element3", 15)
+        self.assertFalse(lwwSet.lookup("element3"))
+        self.assertEqual(lwwSet.size(), 1)
+        
+    def testSizeAfterPartialClear(self):
+        lwwSet = LWWColumnarSet()
+        lwwSet.addAll(range(100), range(100))
+        lwwSet.remove(80, 200)
+        
+        lwwSet.clear(50)
+        lwwSet.add(10, 300)
+        lwwSet.add(90, 300)
+        
+        self.assertEqual(lwwSet.size(), 50)
+        self.assertEqual(len(list(lwwSet)), 50)
+        
+        lwwSet.clear(1000)
+        self.assertEqual(lwwSet.size(), 0)
+        
+    def testMerge(self):
+        replicaA = LWWColumnarSet()
+        replicaB = LWWColumnarSet()
+        
+        replicaA.add("element1", 10)
+        replicaA.add("element2", 20)
+        replicaB.remove("element2", 30)
+        replicaB.add("element3", 40)
+        
+        replicaA.merge(replicaB)
+        replicaB.merge(replicaA)
+        
+        for replica in [replicaA, replicaB]:
+            self.assertTrue(replica.lookup("element1"))
+            self.assertFalse(replica.lookup("element2"))
+            self.assertTrue(replica.lookup("element3"))
+            self.assertEqual(replica.size(), 2)
+    
+    def testDeltasAreCompatibleWithLWWSet(self):
+        columnar = LWWColumnarSet()
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 10)
+        lwwSet.add("element2", 20)
+        lwwSet.remove("element1", 30)
+        columnar.merge(lwwSet)
+        self.assertFalse(columnar.lookup("element1"))
+        self.assertTrue(columnar.lookup("element2"))
+        
+        version = columnar.getVersion()
+        columnar.add("element3", 40)
+        lwwSet.applyDelta(columnar.deltaSince(version))
+        self.assertTrue(lwwSet.lookup("element3"))
+    
+    def testLWWSetMergesColumnarSet(self):
+        columnar = LWWColumnarSet()
+        lwwSet = LWWSet()
+        
+        columnar.add("element1", 10)
+        columnar.add("element2", 20)
+        columnar.remove("element1", 30)
+        lwwSet.add("element1", 40)
+        lwwSet.merge(columnar)
+        
+        self.assertTrue(lwwSet.lookup("element1"))
+        self.assertTrue(lwwSet.lookup("element2"))
+        self.assertEqual(lwwSet.size(), 2)
+    
+    def testIntValuesAreStoredInColumns(self):
+        lwwSet = LWWColumnarSet()
+        values = [(i * 7919) % 10007 - 5000 for i in range(5000)]
+        
+        lwwSet.addAll(values, 10)
+        for value in values[::2]:
+            lwwSet.remove(value, 20)
+        
+        self.assertIsNotNone(lwwSet._values)
+        self.assertGreater(len(lwwSet._sortedValues), len(lwwSet._ids))
+        self.assertEqual([value for value, _timestamp in lwwSet], values[1::2])
+        self.assertTrue(all(lwwSet.lookup(value) for value in values[1::2]))
+        self.assertFalse(any(lwwSet.lookup(value) for value in values[::2]))
+        self.assertFalse(lwwSet.lookup(10007) or lwwSet.lookup("element"))
+        self.assertEqual(lwwSet.size(), 2500)
+    
+    def testValueOfAnotherTypeMovesIntValuesIntoDictionary(self):
+        lwwSet = LWWColumnarSet()
+        lwwSet.addAll(range(3000), 10)
+        snapshot = lwwSet.snapshot()
+        
+        lwwSet.add(2 ** 64, 20)
+        lwwSet.add("element", 20)
+        
+        self.assertIsNone(lwwSet._values)
+        self.assertEqual([value for value, _timestamp in lwwSet], list(range(3000)) + [2 ** 64, "element"])
+        self.assertTrue(lwwSet.lookup(2999) and lwwSet.lookup(2 ** 64) and lwwSet.lookup("element"))
+        self.assertEqual(snapshot.size(), 3000)
+        self.assertFalse(snapshot.lookup(2 ** 64))
+        self.assertTrue(snapshot.lookup(2999))
+    
+    def testMergeOfIntValues(self):
+        replicaA = LWWColumnarSet()
+        replicaB = LWWColumnarSet()
+        replicaA.addAll(range(0, 4000, 2), 10)
+        replicaB.addAll(range(0, 4000, 3), 20)
+        replicaB.removeAll(range(0, 4000, 4), 30)
+        
+        replicaA.merge(replicaB)
+        replicaA.compact(40)
+        
+        expected = {value for value in range(4000) if (value % 2 == 0 or value % 3 == 0) and value % 4 != 0}
+        self.assertEqual({value for value, _timestamp in replicaA}, expected)
+        self.assertTrue(all(replicaA.lookup(value) for value in expected))
+        self.assertFalse(replicaA.lookup(4))
+        self.assertEqual(replicaA.size(), len(expected))
+    
+    def testCompact(self):
+        lwwSet = LWWColumnarSet()
+        
+        lwwSet.add("element1", 10)
+        lwwSet.remove("element1", 20)
+        lwwSet.add("element2", 30)
+        lwwSet.remove("element2", 25)
+        
+        lwwSet.compact(50)
+        self.assertEqual(len(lwwSet._ids), 1)
+        self.assertTrue(lwwSet.lookup("element2"))
+        self.assertFalse(lwwSet.lookup("element1"))
+        self.assertEqual(lwwSet.size(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
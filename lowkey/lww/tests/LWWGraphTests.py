@@ -320,6 +320,68 @@ class LWWGrapTests(unittest.TestCase):
         self.assertTrue(lwwGraph.vertexExists(v1))
         self.assertTrue(lwwGraph.vertexExists(v2))
         
+    def testAdjacencyAfterEdgeRemoval(self):
+        lwwGraph = LWWGraph()
+        
+        v1 = LWWVertex()
+        v1.add("name", "A", 1)
+        v2 = LWWVertex()
+        v2.add("name", "B", 2)
+        v3 = LWWVertex()
+        v3.add("name", "C", 3)
+        
+        lwwGraph.addVertex(v1, 10)
+        lwwGraph.addVertex(v2, 20)
+        lwwGraph.addVertex(v3, 30)
+        lwwGraph.addEdgeWithName("edgeAtoB", v1, v2, 40)
+        lwwGraph.addEdgeWithName("edgeCtoB", v3, v2, 50)
+        
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex(v1), [v2])
+        self.assertEqual(lwwGraph.getIncomingAdjacencyListForVertex(v2), [v1, v3])
+        self.assertEqual(lwwGraph.getIncomingAdjacencyListForVertex(v1), [])
+        
+        lwwGraph.removeEdgeByName("edgeAtoB", 60)
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex(v1), [])
+        self.assertEqual(lwwGraph.getIncomingAdjacencyListForVertex(v2), [v3])
+        
+        lwwGraph.removeVertex(v1, 70)
+        self.assertFalse(lwwGraph.vertexExists(v1))
+        self.assertRaises(Exception, lwwGraph.removeVertex, v2, 80)
+        
+    def testEdgesWithIdenticalNames(self):
+        lwwGraph = LWWGraph()
+        
+        v1 = LWWVertex()
+        v1.add("name", "A", 1)
+        v2 = LWWVertex()
+        v2.add("name", "B", 2)
+        
+        e1 = LWWEdge()
+        e1.add("name", "edgeAtoB", 3)
+        e1.add("from", v1, 3)
+        e1.add("to", v2, 3)
+        
+        e2 = LWWEdge()
+        e2.add("name", "edgeAtoB", 4)
+        e2.add("from", v1, 4)
+        e2.add("to", v2, 4)
+        
+        lwwGraph.addVertex(v1, 10)
+        lwwGraph.addVertex(v2, 20)
+        
+        """Two replicas concurrently add an edge with the same name, one of them removes its own."""
+        lwwGraph.addEdge(e1, 30)
+        lwwGraph.addEdge(e2, 31)
+        lwwGraph.removeEdge(e1, 40)
+        
+        self.assertTrue(lwwGraph.edgeExistsWithName("edgeAtoB"))
+        self.assertTrue(lwwGraph.edgeExists(e2))
+        self.assertEqual(len(lwwGraph.getAdjacencyListForVertex(v1)), 1)
+        
+        lwwGraph.removeEdgeByName("edgeAtoB", 50)
+        self.assertFalse(lwwGraph.edgeExistsWithName("edgeAtoB"))
+        self.assertRaises(Exception, lwwGraph.removeEdgeByName, "edgeAtoB", 60)
+        
     def testGraphAsEdgeEndpoint(self):
         lwwGraph = LWWGraph()
         lwwGraph.add("name", "root", 1)
@@ -346,5 +408,125 @@ class LWWGrapTests(unittest.TestCase):
         graphVirtualAdjacencySet = lwwGraph.getAdjacencyListForVertex(lwwGraph)
         self.assertEqual(len(graphVirtualAdjacencySet), 1)
         
+    def testChangingEndpointOfEdgeReindexesIt(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.importGraph(["a", "b", "c"], [], 1)
+        edge = LWWEdge()
+        edge.add("name", "e", 2)
+        edge.add("from", "a", 2)
+        edge.add("to", "b", 2)
+        lwwGraph.addEdge(edge, 3)
+        
+        edge.update("to", "c", 4)
+        
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("a"), ["c"])
+        self.assertEqual(lwwGraph.getIncomingAdjacencyListForVertex("b"), [])
+        self.assertEqual(lwwGraph.getIncomingAdjacencyListForVertex("c"), ["a"])
+        lwwGraph.removeVertex("b", 5)
+        self.assertRaises(Exception, lwwGraph.removeVertex, "c", 5)
+        
+    def testRenamingEdgeReindexesIt(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.importGraph(["a", "b"], [], 1)
+        edge = LWWEdge()
+        edge.add("name", "e", 2)
+        edge.add("from", "a", 2)
+        edge.add("to", "b", 2)
+        lwwGraph.addEdge(edge, 3)
+        
+        edge.update("name", "f", 4)
+        
+        self.assertFalse(lwwGraph.edgeExistsWithName("e"))
+        self.assertTrue(lwwGraph.edgeExistsWithName("f"))
+        lwwGraph.removeEdgeByName("f", 5)
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("a"), [])
+        
+    def testImportGraph(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.importGraph(["A", "B", "C"], [("AtoB", "A", "B"), ("BtoC", "B", "C")], 10)
+        
+        self.assertEqual(lwwGraph.numberOfVertices(), 3)
+        self.assertTrue(lwwGraph.edgeExistsWithName("AtoB"))
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("A"), ["B"])
+        self.assertEqual(lwwGraph.getIncomingAdjacencyListForVertex("C"), ["B"])
+        
+        lwwGraph.removeEdgeByName("AtoB", 20)
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("A"), [])
+        
+    def testImportGraphWithTimestampColumns(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.removeVertex("C", 15)
+        lwwGraph.importGraph(["A", "B", "C"], [("AtoB", "A", "B")], [10, 20, 10], [30])
+        
+        self.assertTrue(lwwGraph.vertexExists("B"))
+        self.assertFalse(lwwGraph.vertexExists("C"))
+        self.assertEqual(list(lwwGraph.exportEdges()), [("AtoB", "A", "B", 30)])
+        
+    def testImportGraphRequiresEdgeTimestampsWithVertexColumn(self):
+        lwwGraph = LWWGraph()
+        edges = [("AtoB", "A", "B"), ("BtoC", "B", "C"), ("CtoA", "C", "A"), ("AtoC", "A", "C")]
+        
+        self.assertRaises(Exception, lwwGraph.importGraph, ["A", "B", "C"], edges, [1, 2, 3])
+        self.assertRaises(Exception, lwwGraph.importGraph, ["A", "B", "C"], edges, iter([1, 2, 3]))
+        self.assertEqual(lwwGraph.numberOfVertices(), 0)
+        
+        lwwGraph.importGraph(["A", "B", "C"], edges, iter([1, 2, 3]), iter([4, 5, 6, 7]))
+        self.assertEqual(sorted(edge[3] for edge in lwwGraph.exportEdges()), [4, 5, 6, 7])
+        
+    def testImportGraphRejectsColumnsOfOtherLengths(self):
+        lwwGraph = LWWGraph()
+        edges = [("AtoB", "A", "B"), ("BtoC", "B", "C")]
+        
+        self.assertRaises(Exception, lwwGraph.importGraph, ["A", "B", "C"], edges, [1, 2])
+        self.assertRaises(Exception, lwwGraph.importGraph, ["A", "B", "C"], edges, [1, 2, 3], [4])
+        self.assertRaises(Exception, lwwGraph.importGraph, ["A", "B", "C"], edges, 1, iter([4, 5, 6]))
+        self.assertEqual(lwwGraph.numberOfVertices(), 0)
+        
+    def testImportGraphValidatesEndpoints(self):
+        lwwGraph = LWWGraph()
+        
+        self.assertRaises(KeyError, lwwGraph.importGraph, ["A", "B"], [("AtoB", "A", "B"), ("AtoC", "A", "C")], 10)
+        self.assertFalse(lwwGraph.edgeExistsWithName("AtoB"))
+        self.assertEqual(lwwGraph.numberOfVertices(), 0)
+        
+    def testImportGraphValidatesEndpointsAgainstRemovedVertices(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.removeVertex("C", 15)
+        
+        self.assertRaises(KeyError, lwwGraph.importGraph, ["A", "B", "C"], [("AtoC", "A", "C")], 10)
+        self.assertEqual(lwwGraph.numberOfVertices(), 0)
+        
+        lwwGraph.importGraph(["A", "C"], [("AtoC", "A", "C")], 20)
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("A"), ["C"])
+        
+    def testParallelEdgesInIndexes(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.importGraph(["A", "B"], [("AtoB", "A", "B"), ("AtoB2", "A", "B"), ("AtoB3", "A", "B")], 10)
+        snapshot = lwwGraph.snapshot()
+        
+        lwwGraph.removeEdgeByName("AtoB2", 20)
+        lwwGraph.removeEdgeByName("AtoB", 20)
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("A"), ["B"])
+        self.assertEqual(snapshot.getIncomingAdjacencyListForVertex("B"), ["A", "A", "A"])
+        
+        lwwGraph.removeEdgeByName("AtoB3", 20)
+        self.assertEqual(lwwGraph.getAdjacencyListForVertex("A"), [])
+        lwwGraph.removeVertex("A", 30)
+        self.assertFalse(lwwGraph.vertexExists("A"))
+        
+    def testExportAndReimportGraph(self):
+        lwwGraph = LWWGraph()
+        lwwGraph.importGraph(range(100), ((i, i, i + 1) for i in range(99)), 10)
+        lwwGraph.removeEdgeByName(50, 20)
+        
+        vertices, vertexTimestamps = zip(*lwwGraph.exportVertices())
+        edges = list(lwwGraph.exportEdges())
+        copiedGraph = LWWGraph()
+        copiedGraph.importGraph(vertices, (edge[:3] for edge in edges), vertexTimestamps, [edge[3] for edge in edges])
+        
+        self.assertEqual(copiedGraph.numberOfVertices(), 100)
+        self.assertEqual(sorted(copiedGraph.exportEdges()), sorted(edges))
+        self.assertFalse(copiedGraph.isReachable(0, 99))
+        
 if __name__ == "__main__":
     unittest.main()
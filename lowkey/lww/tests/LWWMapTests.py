@@ -61,6 +61,49 @@ class LWWMapTests(unittest.TestCase):
         self.assertFalse(self.lwwMap.lookup(key1), value1)
         self.assertEqual(self.lwwMap.size(), 0)
 
+    def testUpdateReplacesEntry(self):
+        key1 = "name"
+        self.lwwMap.add(key1, "Istvan", 10)
+        self.lwwMap.update(key1, "David", 20)
+        
+        self.assertEqual(self.lwwMap.query(key1), "David")
+        self.assertEqual(self.lwwMap.size(), 1)
+        self.assertEqual([entry for entry in self.lwwMap.entrySet()], [((key1, "David"), 20)])
+
+    def testQueryRemovedOrUnknownKey(self):
+        key1 = "name"
+        self.lwwMap.add(key1, "Istvan", 10)
+        self.lwwMap.remove(key1, 20)
+        
+        self.assertIsNone(self.lwwMap.query(key1))
+        self.assertIsNone(self.lwwMap.query("unknown"))
+        
+        self.lwwMap.add(key1, "David", 15)
+        self.assertIsNone(self.lwwMap.query(key1))
+        
+        self.lwwMap.add(key1, "David", 30)
+        self.assertEqual(self.lwwMap.query(key1), "David")
+
+    def testBulkOperations(self):
+        self.lwwMap.addAll(["firstName", "lastName", "firstName"], ["Istvan", "David", "Eugene"], [10, 20, 30])
+        self.assertEqual(self.lwwMap.query("firstName"), "Eugene")
+        self.assertEqual(self.lwwMap.query("lastName"), "David")
+        
+        self.lwwMap.removeAll(["lastName"], 40)
+        self.assertFalse(self.lwwMap.lookup("lastName"))
+        self.assertEqual(self.lwwMap.size(), 1)
+
+    def testClear(self):
+        self.lwwMap.add("firstName", "Istvan", 10)
+        self.lwwMap.add("lastName", "David", 20)
+        
+        self.lwwMap.clear(30)
+        self.assertEqual(self.lwwMap.size(), 0)
+        self.assertIsNone(self.lwwMap.query("firstName"))
+        
+        self.lwwMap.add("firstName", "Eugene", 40)
+        self.assertEqual(self.lwwMap.query("firstName"), "Eugene")
+
     def testIterateOverEntries(self):
         key1 = "firstName"
         value1 = "Istvan"
@@ -135,6 +178,45 @@ class LWWMapTests(unittest.TestCase):
                 
         self.assertEqual(entriesVisited, 2)
 
+    def testNestedIterationsOverKeys(self):
+        self.lwwMap.add("firstName", "Istvan", 10)
+        self.lwwMap.add("lastName", "David", 20)
+        
+        keySet = self.lwwMap.keySet()
+        pairs = [(key1, key2) for key1 in keySet for key2 in keySet]
+        self.assertEqual(len(pairs), 4)
+
+    def testLiveViews(self):
+        keySet = self.lwwMap.keySet()
+        entrySet = self.lwwMap.entrySet()
+        self.assertEqual(len(keySet), 0)
+        
+        self.lwwMap.add("firstName", "Istvan", 10)
+        self.lwwMap.add("lastName", "David", 20)
+        self.assertEqual(len(keySet), 2)
+        self.assertEqual(len(entrySet), 2)
+        self.assertTrue("firstName" in keySet)
+        self.assertFalse("profession" in keySet)
+        self.assertTrue((("lastName", "David"), 20) in entrySet)
+        self.assertFalse((("lastName", "David"), 10) in entrySet)
+        self.assertFalse("lastName" in entrySet)
+        
+        self.lwwMap.remove("firstName", 30)
+        self.assertEqual(len(keySet), 1)
+        self.assertFalse("firstName" in keySet)
+        
+    def testViewSetAlgebra(self):
+        self.lwwMap.add("firstName", "Istvan", 10)
+        self.lwwMap.add("lastName", "David", 20)
+        keySet = self.lwwMap.keySet()
+        
+        self.assertEqual(keySet & {"lastName", "profession"}, {"lastName"})
+        self.assertEqual(keySet | {"profession"}, {"firstName", "lastName", "profession"})
+        self.assertEqual(keySet - {"lastName"}, {"firstName"})
+        self.assertTrue(keySet <= {"firstName", "lastName", "profession"})
+        self.assertTrue(keySet == {"firstName", "lastName"})
+        self.assertTrue(keySet.isdisjoint({"profession"}))
+
     """
     def testRemoveNotexisting(self):
         lwwMap = LWWMap()
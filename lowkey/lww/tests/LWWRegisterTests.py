@@ -59,6 +59,28 @@ class LWWRegisterTests(unittest.TestCase):
         self.assertTrue(lwwRegister2.getId())
         self.assertEqual(lwwRegister1.getId(), lwwRegister2.getId())
 
+        
+    def testSuppliedIdentifiers(self):
+        lwwRegister1 = LWWRegister(identifier=1)
+        lwwRegister2 = LWWRegister(identifier=1)
+        self.assertEqual(lwwRegister1.getId(), 1)
+        self.assertEqual(lwwRegister1, lwwRegister2)
+        
+        lwwRegister3 = LWWRegister(identifier="".join(["register", "3"]))
+        lwwRegister4 = LWWRegister(identifier="".join(["register", "3"]))
+        self.assertIs(lwwRegister3.getId(), lwwRegister4.getId())
+        
+    def testHashIsStableAcrossUpdates(self):
+        lwwRegister = LWWRegister()
+        lwwRegister.update("message 1", 10)
+        hashBefore = hash(lwwRegister)
+        lwwRegister.update("message 2", 20)
+        self.assertEqual(hash(lwwRegister), hashBefore)
+        self.assertEqual(hash(lwwRegister), hash(LWWRegister(prototype=lwwRegister)))
+        
+    def testNoInstanceDictionary(self):
+        self.assertFalse(hasattr(LWWRegister(), "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -180,6 +180,26 @@ class LWWSetTests(unittest.TestCase):
         lwwSet.clear(30)
         self.assertEqual(lwwSet.size(), 0)
 
+    def testClearRemovesOlderValuesOnly(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 10)
+        lwwSet.add("element2", 30)
+        lwwSet.clear(20)
+        self.assertFalse(lwwSet.lookup("element1"))
+        self.assertTrue(lwwSet.lookup("element2"))
+        self.assertEqual(lwwSet.size(), 1)
+        
+        """Delayed adds older than the clear are removed too."""
+        lwwSet.add("element3", 15)
+        self.assertFalse(lwwSet.lookup("element3"))
+        lwwSet.add("element3", 25)
+        self.assertTrue(lwwSet.lookup("element3"))
+        
+        """Older clears have no effect."""
+        lwwSet.clear(5)
+        self.assertEqual(lwwSet.size(), 2)
+        
     def testIterations(self):
         lwwSet = LWWSet()
         
@@ -224,6 +244,96 @@ class LWWSetTests(unittest.TestCase):
             i += 1
         self.assertEqual(i, 0)  
     
+    def testNestedIterations(self):
+        lwwSet = LWWSet()
+        
+        for i in range(10):
+            lwwSet.add(i, i)
+        
+        pairs = [(a, b) for a, _ in lwwSet for b, _ in lwwSet]
+        self.assertEqual(len(pairs), 100)
+        
+        iterator1 = iter(lwwSet)
+        iterator2 = iter(lwwSet)
+        self.assertEqual(next(iterator1), (0, 0))
+        self.assertEqual(next(iterator1), (1, 1))
+        self.assertEqual(next(iterator2), (0, 0))
+    
+    def testOlderOperationsAreRejected(self):
+        lwwSet = LWWSet()
+        
+        element1 = "element1"
+        
+        self.assertTrue(lwwSet.add(element1, 20))
+        self.assertFalse(lwwSet.add(element1, 10))
+        self.assertTrue(lwwSet.lookup(element1))
+        
+        self.assertTrue(lwwSet.remove(element1, 40))
+        self.assertFalse(lwwSet.remove(element1, 30))
+        self.assertFalse(lwwSet.lookup(element1))
+        
+    def testAddWinsOnIdenticalTimestamps(self):
+        lwwSet = LWWSet()
+        
+        element1 = "element1"
+        
+        lwwSet.remove(element1, 10)
+        lwwSet.add(element1, 10)
+        self.assertTrue(lwwSet.lookup(element1))
+        self.assertEqual(lwwSet.size(), 1)
+        
+    def testDelayedAddDoesNotResurrectRemovedElement(self):
+        lwwSet = LWWSet()
+        
+        element1 = "element1"
+        
+        lwwSet.remove(element1, 20)
+        lwwSet.add(element1, 10)
+        self.assertFalse(lwwSet.lookup(element1))
+        self.assertEqual(lwwSet.size(), 0)
+        
+        lwwSet.add(element1, 30)
+        self.assertTrue(lwwSet.lookup(element1))
+        self.assertEqual([e for e in lwwSet], [(element1, 30)])
+        
+    def testManyElements(self):
+        lwwSet = LWWSet()
+        
+        for i in range(1000):
+            lwwSet.add(i, i)
+        for i in range(0, 1000, 2):
+            lwwSet.remove(i, 1000)
+        
+        self.assertEqual(lwwSet.size(), 500)
+        self.assertFalse(lwwSet.lookup(0))
+        self.assertTrue(lwwSet.lookup(1))
+    
+    def testBulkOperations(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.add("element1", 50)
+        lwwSet.addAll(["element1", "element2", "element2", "element3"], [10, 20, 40, 30])
+        self.assertEqual(lwwSet.size(), 3)
+        self.assertEqual(sorted(e for e in lwwSet), [("element1", 50), ("element2", 40), ("element3", 30)])
+        
+        lwwSet.removeAll(["element1", "element2"], 45)
+        self.assertTrue(lwwSet.lookup("element1"))
+        self.assertFalse(lwwSet.lookup("element2"))
+        self.assertEqual(lwwSet.size(), 2)
+    
+    def testBulkLoadIntoEmptySet(self):
+        lwwSet = LWWSet()
+        
+        lwwSet.addAll(["element1", "element2", "element2", "element3"], [30, 20, 40, 10])
+        self.assertEqual(lwwSet.size(), 3)
+        self.assertEqual(list(lwwSet.changesSince(0)), [(False, ("element3", 10)), (False, ("element1", 30)), (False, ("element2", 40))])
+        self.assertEqual(lwwSet.getVersion(), 3)
+        
+        lwwSet.remove("element1", 35)
+        lwwSet.add("element3", 5)
+        self.assertFalse(lwwSet.lookup("element1"))
+        self.assertEqual(sorted(e for e in lwwSet), [("element2", 40), ("element3", 10)])
+    
     def testIterationContents(self):
         lwwSet = LWWSet()
         
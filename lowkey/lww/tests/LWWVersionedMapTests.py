@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.LWWVersionedMap import LWWVersionedMap
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class LWWVersionedMapTests(unittest.TestCase):
+
+    def testAddRemoveUpdate(self):
+        lwwMap = LWWVersionedMap()
+        
+        lwwMap.add("key1", "value1", 10)
+        self.assertTrue(lwwMap.lookup("key1"))
+        self.assertEqual(lwwMap.query("key1"), "value1")
+        self.assertEqual(lwwMap.size(), 1)
+        
+        lwwMap.update("key1", "value2", 20)
+        self.assertEqual(lwwMap.query("key1"), "value2")
+        self.assertEqual(lwwMap.size(), 1)
+        
+        lwwMap.remove("key1", 30)
+        self.assertFalse(lwwMap.lookup("key1"))
+        self.assertEqual(lwwMap.query("key1"), None)
+        self.assertEqual(lwwMap.size(), 0)
+        
+    def testDelayedOperations(self):
+        lwwMap = LWWVersionedMap()
+        
+        lwwMap.add("key1", "value1", 30)
+        self.assertFalse(lwwMap.add("key1", "value0", 10))
+        lwwMap.remove("key1", 20)
+        self.assertEqual(lwwMap.query("key1"), "value1")
+        
+        lwwMap.remove("key2", 20)
+        lwwMap.add("key2", "value2", 10)
+        self.assertFalse(lwwMap.lookup("key2"))
+        self.assertEqual(lwwMap.size(), 1)
+        
+    def testVersionsStayReadable(self):
+        lwwMap = LWWVersionedMap()
+        lwwMap.add("key1", "value1", 10)
+        version1 = lwwMap.currentVersion()
+        
+        lwwMap.add("key1", "value2", 20)
+        lwwMap.add("key2", "value3", 20)
+        version2 = lwwMap.currentVersion()
+        lwwMap.remove("key1", 30)
+        
+        self.assertEqual(version1.query("key1"), "value1")
+        self.assertFalse(version1.lookup("key2"))
+        self.assertEqual(version1.size(), 1)
+        self.assertEqual(version2.query("key1"), "value2")
+        self.assertEqual(version2.size(), 2)
+        self.assertFalse(lwwMap.lookup("key1"))
+        self.assertLess(version1.getNumber(), version2.getNumber())
+        self.assertEqual(lwwMap.getVersion(), version2.getNumber() + 1)
+        
+    def testRevert(self):
+        lwwMap = LWWVersionedMap()
+        lwwMap.add("key1", "value1", 10)
+        version = lwwMap.currentVersion()
+        lwwMap.update("key1", "value2", 20)
+        
+        lwwMap.revert(version)
+        
+        self.assertEqual(lwwMap.query("key1"), "value1")
+        self.assertGreater(lwwMap.getVersion(), version.getNumber())
+        
+    def testIterationAndClear(self):
+        lwwMap = LWWVersionedMap()
+        lwwMap.addAll(range(10), range(10), 10)
+        lwwMap.remove(5, 20)
+        
+        self.assertEqual(sorted(lwwMap), [((i, i), 10) for i in range(10) if i != 5])
+        
+        version = lwwMap.currentVersion()
+        lwwMap.clear(30)
+        lwwMap.add(1, 1, 40)
+        
+        self.assertEqual(list(lwwMap), [((1, 1), 40)])
+        self.assertEqual(lwwMap.size(), 1)
+        self.assertEqual(version.size(), 9)
+    
+    def testSizeAfterPartialClear(self):
+        lwwMap = LWWVersionedMap()
+        lwwMap.addAll(range(10), range(10), 10)
+        lwwMap.addAll(range(10, 15), range(10, 15), 30)
+        
+        lwwMap.clear(20)
+        self.assertIsNone(lwwMap.currentVersion()._size)  # recounted on demand, not by the clear
+        lwwMap.remove(12, 40)
+        lwwMap.add(0, 0, 40)
+        
+        self.assertEqual(lwwMap.size(), 5)
+        self.assertEqual(lwwMap.size(), sum(1 for _entry in lwwMap))
+        lwwMap.clear(50)
+        self.assertEqual(lwwMap.currentVersion()._size, 0)
+        
+    def testMerge(self):
+        lwwMap1 = LWWVersionedMap()
+        lwwMap2 = LWWVersionedMap()
+        
+        lwwMap1.add("key1", "value1", 10)
+        lwwMap2.add("key1", "value2", 20)
+        lwwMap2.add("key2", "value3", 20)
+        lwwMap1.remove("key2", 30)
+        
+        lwwMap1.merge(lwwMap2)
+        lwwMap2.merge(lwwMap1)
+        
+        for lwwMap in [lwwMap1, lwwMap2]:
+            self.assertEqual(lwwMap.query("key1"), "value2")
+            self.assertFalse(lwwMap.lookup("key2"))
+            self.assertEqual(lwwMap.size(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
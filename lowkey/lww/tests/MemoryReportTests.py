@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+import unittest
+
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWSet import LWWSet
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class MemoryReportTests(unittest.TestCase):
+
+    def testSetReport(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        lwwSet.add("element1", 20)
+        lwwSet.add("element2", 10)
+        lwwSet.remove("element2", 30)
+        
+        report = lwwSet.memoryReport()
+        
+        self.assertEqual(report['live']['entries'], 1)
+        self.assertEqual(report['dominated']['entries'], 2)
+        self.assertEqual(report['tombstones']['entries'], 1)
+        self.assertEqual(report['nested']['objects'], 0)
+        self.assertGreater(report['live']['bytes'], 0)
+        self.assertGreater(report['structures']['bytes'], 0)
+        self.assertEqual(report['bytes'], sum(report[category]['bytes'] for category in ['live', 'dominated', 'tombstones', 'structures', 'nested']))
+        
+    def testCompactionShrinksReport(self):
+        lwwSet = LWWSet()
+        for i in range(100):
+            lwwSet.add(i, 10)
+            lwwSet.remove(i, 20)
+        before = lwwSet.memoryReport()
+        
+        lwwSet.compact(100)
+        after = lwwSet.memoryReport()
+        
+        self.assertEqual(before['tombstones']['entries'], 100)
+        self.assertEqual(after['tombstones']['entries'], 0)
+        self.assertEqual(after['dominated']['entries'], 0)
+        self.assertLess(after['bytes'], before['bytes'])
+        
+    def testNestedStructuresAreCountedOnce(self):
+        innerMap = LWWMap()
+        innerMap.add("key1", "value1", 10)
+        lwwMap = LWWMap()
+        lwwMap.add("key1", innerMap, 10)
+        lwwMap.add("key2", innerMap, 10)
+        lwwMap.add("key3", lwwMap, 10)
+        
+        report = lwwMap.memoryReport()
+        
+        self.assertEqual(report['nested']['objects'], 1)
+        self.assertEqual(report['nested']['bytes'], innerMap.memoryReport()['bytes'])
+        
+    def testGraphReport(self):
+        graph = LWWGraph()
+        graph.addVertex("v1", 10)
+        graph.addVertex("v2", 10)
+        graph.addEdgeWithName("e1", "v1", "v2", 20)
+        graph.removeEdgeByName("e1", 30)
+        
+        report = graph.memoryReport()
+        
+        self.assertEqual(report['vertices']['live']['entries'], 2)
+        self.assertEqual(report['edges']['live']['entries'], 0)
+        self.assertEqual(report['edges']['tombstones']['entries'], 1)
+        self.assertEqual(report['edges']['nested']['objects'], 1)
+        self.assertEqual(report['bytes'], sum(report[category]['bytes'] for category in
+                                              ['live', 'dominated', 'tombstones', 'structures', 'nested', 'vertices', 'edges', 'indexes']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+import copy
+import unittest
+
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWRegister import LWWRegister
+from lowkey.lww.LWWSet import LWWSet
+from lowkey.lww.LWWVersionedMap import LWWVersionedMap
+from lowkey.lww.LWWVertex import LWWVertex
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class MergeTests(unittest.TestCase):
+
+    def testMergeSets(self):
+        replicaA = LWWSet()
+        replicaB = LWWSet()
+        
+        replicaA.add("element1", 10)
+        replicaA.add("element2", 20)
+        replicaB.add("element2", 15)
+        replicaB.remove("element2", 30)
+        replicaB.add("element3", 40)
+        
+        replicaA.merge(replicaB)
+        replicaB.merge(replicaA)
+        
+        for replica in [replicaA, replicaB]:
+            self.assertTrue(replica.lookup("element1"))
+            self.assertFalse(replica.lookup("element2"))
+            self.assertTrue(replica.lookup("element3"))
+            self.assertEqual(replica.size(), 2)
+    
+    def testMergeIsIdempotent(self):
+        replicaA = LWWSet()
+        replicaB = LWWSet()
+        
+        replicaA.add("element1", 10)
+        replicaB.remove("element1", 20)
+        
+        replicaA.merge(replicaB)
+        replicaA.merge(replicaB)
+        self.assertFalse(replicaA.lookup("element1"))
+        self.assertEqual(len(replicaA._removeSet), 1)
+    
+    def testMergeOfKnownEntriesKeepsVersion(self):
+        replicaA = LWWSet()
+        replicaB = LWWSet()
+        replicaA.addAll(range(1000), 10)
+        replicaA.removeAll(range(10), 20)
+        
+        replicaB.merge(replicaA)
+        version = replicaA.getVersion()
+        replicaA.merge(replicaB)
+        
+        self.assertEqual(replicaA.getVersion(), version)
+        self.assertFalse(replicaA.changedSince(version))
+        self.assertEqual(replicaA.deltaSince(version), ((), (), None))
+    
+    def testMergeMaps(self):
+        replicaA = LWWMap()
+        replicaB = LWWMap()
+        
+        replicaA.add("firstName", "Istvan", 10)
+        replicaB.add("firstName", "Eugene", 20)
+        replicaA.add("lastName", "David", 30)
+        replicaB.add("lastName", "Syriani", 5)
+        
+        replicaA.merge(replicaB)
+        replicaB.merge(replicaA)
+        
+        for replica in [replicaA, replicaB]:
+            self.assertEqual(replica.query("firstName"), "Eugene")
+            self.assertEqual(replica.query("lastName"), "David")
+    
+    def testMergeOfEqualTimestampsCommutes(self):
+        replicaA = LWWMap()
+        replicaB = LWWMap()
+        replicaA.add("key", "x", 5)
+        replicaB.add("key", "y", 5)
+        
+        mergedAB = copy.deepcopy(replicaA)
+        mergedAB.merge(replicaB)
+        mergedBA = copy.deepcopy(replicaB)
+        mergedBA.merge(replicaA)
+        replicaA.merge(replicaB)
+        replicaB.merge(replicaA)
+        
+        self.assertEqual(mergedAB.query("key"), mergedBA.query("key"))
+        self.assertEqual(replicaA.query("key"), replicaB.query("key"))
+        self.assertEqual(replicaA.digest(), replicaB.digest())
+    
+    def testMergeOfRegistersOfEqualTimestampsCommutes(self):
+        replicaA = LWWRegister("x", 5, identifier="register")
+        replicaB = LWWRegister("y", 5, identifier="register")
+        
+        mergedAB = copy.deepcopy(replicaA)
+        mergedAB.merge(replicaB)
+        mergedBA = copy.deepcopy(replicaB)
+        mergedBA.merge(replicaA)
+        
+        self.assertEqual(mergedAB.query(), mergedBA.query())
+    
+    def testMergeOfVersionedMapsOfEqualTimestampsCommutes(self):
+        replicaA = LWWVersionedMap()
+        replicaB = LWWVersionedMap()
+        replicaA.add("key", "x", 5)
+        replicaB.add("key", "y", 5)
+        
+        mergedAB = copy.deepcopy(replicaA)
+        mergedAB.merge(replicaB)
+        mergedBA = copy.deepcopy(replicaB)
+        mergedBA.merge(replicaA)
+        
+        self.assertEqual(mergedAB.query("key"), mergedBA.query("key"))
+    
+    def testMergeRegisters(self):
+        replicaA = LWWRegister()
+        replicaB = LWWRegister(prototype=replicaA)
+        
+        replicaA.update("valueA", 10)
+        replicaB.update("valueB", 20)
+        
+        replicaA.merge(replicaB)
+        replicaB.merge(replicaA)
+        
+        self.assertEqual(replicaA.query(), "valueB")
+        self.assertEqual(replicaB.query(), "valueB")
+    
+    def testMergeGraphs(self):
+        v1 = LWWVertex()
+        v1.add("name", "A", 1)
+        v2 = LWWVertex()
+        v2.add("name", "B", 2)
+        
+        replicaA = LWWGraph()
+        replicaA.addVertex(v1, 10)
+        replicaA.addVertex(v2, 20)
+        
+        replicaB = LWWGraph()
+        replicaB.merge(replicaA)
+        self.assertEqual(replicaB.numberOfVertices(), 2)
+        
+        replicaA.addEdgeWithName("edgeAtoB", v1, v2, 30)
+        replicaB.addEdgeWithName("edgeBtoA", v2, v1, 40)
+        
+        replicaA.merge(replicaB)
+        replicaB.merge(replicaA)
+        
+        for replica in [replicaA, replicaB]:
+            self.assertTrue(replica.edgeExistsWithName("edgeAtoB"))
+            self.assertTrue(replica.edgeExistsWithName("edgeBtoA"))
+            self.assertEqual(replica.getAdjacencyListForVertex(v1), [v2])
+            self.assertEqual(replica.getAdjacencyListForVertex(v2), [v1])
+            
+        replicaB.removeEdgeByName("edgeAtoB", 50)
+        replicaA.merge(replicaB)
+        self.assertFalse(replicaA.edgeExistsWithName("edgeAtoB"))
+        self.assertEqual(replicaA.getAdjacencyListForVertex(v1), [])
+        self.assertEqual(replicaA.getIncomingAdjacencyListForVertex(v1), [v2])
+
+
+if __name__ == "__main__":
+    unittest.main()
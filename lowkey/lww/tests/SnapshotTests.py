@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+import unittest
+import weakref
+
+from lowkey.lww.LWWColumnarSet import LWWColumnarSet
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWRegister import LWWRegister
+from lowkey.lww.LWWSet import LWWSet
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class SnapshotTests(unittest.TestCase):
+
+    def testSetSnapshotIsIsolated(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        
+        snapshot = lwwSet.snapshot()
+        lwwSet.add("element2", 20)
+        lwwSet.remove("element1", 30)
+        
+        self.assertTrue(snapshot.lookup("element1"))
+        self.assertFalse(snapshot.lookup("element2"))
+        self.assertEqual(snapshot.size(), 1)
+        self.assertFalse(lwwSet.lookup("element1"))
+        self.assertTrue(lwwSet.lookup("element2"))
+        
+    def testSetSnapshotSharesStructureAfterWrite(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        
+        snapshot = lwwSet.snapshot()
+        self.assertIs(snapshot._addIndex._live, lwwSet._addIndex)
+        
+        lwwSet.add("element2", 20)
+        self.assertIs(snapshot._addIndex._live, lwwSet._addIndex)
+        self.assertEqual(list(snapshot._addIndex._overlay), ["element2"])
+        self.assertFalse(snapshot.lookup("element2"))
+        self.assertEqual(list(snapshot), [("element1", 10)])
+        
+    def testSnapshotIsReadOnly(self):
+        lwwSet = LWWSet()
+        snapshot = lwwSet.snapshot()
+        
+        self.assertRaises(Exception, snapshot.add, "element1", 10)
+        self.assertRaises(Exception, snapshot.remove, "element1", 10)
+        self.assertRaises(Exception, snapshot.clear, 10)
+        self.assertRaises(Exception, snapshot.compact, 10)
+        self.assertIs(snapshot.snapshot(), snapshot)
+        
+    def testSnapshotKeepsVersion(self):
+        lwwSet = LWWSet()
+        lwwSet.add("element1", 10)
+        version = lwwSet.getVersion()
+        
+        snapshot = lwwSet.snapshot()
+        lwwSet.add("element2", 20)
+        
+        self.assertEqual(snapshot.getVersion(), version)
+        self.assertEqual(snapshot.deltaSince(0), ((("element1", 10),), (), None))
+        
+    def testMapSnapshot(self):
+        lwwMap = LWWMap()
+        lwwMap.add("key1", "value1", 10)
+        
+        snapshot = lwwMap.snapshot()
+        lwwMap.update("key1", "value2", 20)
+        
+        self.assertEqual(snapshot.query("key1"), "value1")
+        self.assertEqual(lwwMap.query("key1"), "value2")
+        self.assertEqual(set(snapshot.keySet()), {"key1"})
+        
+    def testGraphSnapshot(self):
+        graph = LWWGraph()
+        graph.addVertex("v1", 10)
+        graph.addVertex("v2", 10)
+        graph.addEdgeWithName("e1", "v1", "v2", 20)
+        
+        snapshot = graph.snapshot()
+        graph.addVertex("v3", 30)
+        graph.addEdgeWithName("e2", "v2", "v3", 40)
+        graph.removeEdgeByName("e1", 50)
+        
+        self.assertEqual(snapshot.numberOfVertices(), 2)
+        self.assertEqual(snapshot.getAdjacencyListForVertex("v1"), ["v2"])
+        self.assertEqual(snapshot.getAdjacencyListForVertex("v2"), [])
+        self.assertEqual(graph.getAdjacencyListForVertex("v1"), [])
+        self.assertEqual(graph.getAdjacencyListForVertex("v2"), ["v3"])
+        self.assertRaises(Exception, snapshot.addVertex, "v4", 60)
+        self.assertRaises(Exception, snapshot.addEdgeWithName, "e3", "v1", "v2", 60)
+        
+    def testGraphSnapshotsAtDifferentTimes(self):
+        graph = LWWGraph()
+        graph.addVertex("v1", 10)
+        graph.addVertex("v2", 10)
+        graph.addEdgeWithName("e1", "v1", "v2", 20)
+        first = graph.snapshot()
+        
+        graph.addEdgeWithName("e2", "v2", "v1", 30)
+        second = graph.snapshot()
+        graph.removeEdgeByName("e1", 40)
+        
+        self.assertEqual(first.getAdjacencyListForVertex("v2"), [])
+        self.assertEqual(second.getAdjacencyListForVertex("v1"), ["v2"])
+        self.assertEqual(second.getAdjacencyListForVertex("v2"), ["v1"])
+        self.assertEqual(graph.getAdjacencyListForVertex("v1"), [])
+        
+    def testUnusedSnapshotsAreFreed(self):
+        graph = LWWGraph()
+        graph.addVertex("v1", 10)
+        
+        snapshot = weakref.ref(graph.snapshot())
+        
+        self.assertIsNone(snapshot())  # freed without garbage collection, so later writes do not preserve anything for it
+        
+    def testGraphSnapshotVersion(self):
+        graph = LWWGraph()
+        graph.addVertex("v1", 10)
+        version = graph.getVersion()
+        
+        snapshot = graph.snapshot()
+        graph.addVertex("v2", 20)
+        
+        self.assertEqual(snapshot.getVersion(), version)
+        self.assertGreater(graph.getVersion(), version)
+        
+    def testColumnarSetSnapshot(self):
+        columnarSet = LWWColumnarSet()
+        columnarSet.add(1, 10)
+        
+        snapshot = columnarSet.snapshot()
+        columnarSet.remove(1, 20)
+        columnarSet.add(2, 20)
+        
+        self.assertTrue(snapshot.lookup(1))
+        self.assertFalse(snapshot.lookup(2))
+        self.assertEqual(snapshot.size(), 1)
+        self.assertRaises(Exception, snapshot.add, 3, 30)
+        
+    def testRegisterSnapshot(self):
+        register = LWWRegister("value1", 10)
+        
+        snapshot = register.snapshot()
+        register.update("value2", 20)
+        
+        self.assertEqual(snapshot.query(), "value1")
+        self.assertEqual(snapshot, register)
+        self.assertRaises(Exception, snapshot.update, "value3", 30)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -2,13 +2,26 @@
 import unittest
 
 from lowkey.lww.tests.EmbeddingTests import EmbeddingTests
+from lowkey.lww.tests.GraphTraversalTests import GraphTraversalTests
+from lowkey.lww.tests.HAMTTests import HAMTTests
+from lowkey.lww.tests.LWWColumnarSetTests import LWWColumnarSetTests
 from lowkey.lww.tests.LWWGraphPartsTests import LWWGraphPartsTests
 from lowkey.lww.tests.LWWGraphTests import LWWGrapTests
 from lowkey.lww.tests.LWWMapTests import LWWMapTests
 from lowkey.lww.tests.LWWRegisterMultiUserTests import LWWRegisterMultiUserTests
 from lowkey.lww.tests.LWWRegisterTests import LWWRegisterTests
 from lowkey.lww.tests.LWWSetTests import LWWSetTests
+from lowkey.lww.tests.LWWVersionedMapTests import LWWVersionedMapTests
 from lowkey.lww.tests.CloningTests import CloningTests
+from lowkey.lww.tests.ChangeQueryTests import ChangeQueryTests
+from lowkey.lww.tests.CompactionTests import CompactionTests
+from lowkey.lww.tests.DeltaTests import DeltaTests
+from lowkey.lww.tests.DigestTests import DigestTests
+from lowkey.lww.tests.MemoryReportTests import MemoryReportTests
+from lowkey.lww.tests.MergeTests import MergeTests
+from lowkey.lww.tests.SnapshotTests import SnapshotTests
+from lowkey.lww.tests.ThreadSafetyTests import ThreadSafetyTests
+from lowkey.lww.tests.VersioningTests import VersioningTests
 
 __author__ = "Istvan David"
 __copyright__ = "Copyright 2021, GEODES"
@@ -21,9 +34,9 @@ Full test suite for the LWW implementations.
 
 
 def create_suite():
-    typeTestCases = [LWWRegisterTests, LWWSetTests, LWWMapTests, LWWGrapTests, LWWGraphPartsTests]
+    typeTestCases = [LWWRegisterTests, LWWSetTests, LWWColumnarSetTests, LWWMapTests, LWWVersionedMapTests, LWWGrapTests, LWWGraphPartsTests, HAMTTests]
     typeUsageTestCases = [LWWRegisterMultiUserTests, EmbeddingTests]
-    behavioralTestCases = [CloningTests]
+    behavioralTestCases = [CloningTests, CompactionTests, MergeTests, DeltaTests, ChangeQueryTests, SnapshotTests, GraphTraversalTests, ThreadSafetyTests, MemoryReportTests, VersioningTests, DigestTests]
     loadedCases = []
     
     for case in typeTestCases + typeUsageTestCases + behavioralTestCases:
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+import copy
+import sys
+import threading
+import unittest
+
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWRegister import LWWRegister
+from lowkey.lww.LWWSet import LWWSet
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class ThreadSafetyTests(unittest.TestCase):
+    
+    def runConcurrently(self, *targets):
+        errors = []
+        
+        def run(target):
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+    
+    def testConcurrentWritersAndReaders(self):
+        lwwSet = LWWSet().makeThreadSafe()
+        n = 2000
+        
+        def write(offset):
+            for i in range(n):
+                lwwSet.add(offset + i, i + 1)
+        
+        def read():
+            for _ in range(50):
+                for value, _timestamp in lwwSet:
+                    lwwSet.lookup(value)
+                lwwSet.deltaSince(0)
+        
+        self.runConcurrently(lambda: write(0), lambda: write(n), read, read)
+        
+        self.assertEqual(lwwSet.size(), 2 * n)
+        self.assertEqual(len(lwwSet.deltaSince(0)[0]), 2 * n)
+        
+    def testConcurrentChangeQueries(self):
+        lwwSet = LWWSet().makeThreadSafe()
+        n = 2000
+        
+        def write():
+            for i in range(n):
+                lwwSet.add(i, i + 1)
+        
+        def read():
+            for _ in range(50):
+                version = lwwSet.getVersion()
+                adds, _removes, _clearedBefore = lwwSet.deltaSince(version // 2)
+                self.assertGreaterEqual(len(adds), version - version // 2)
+                timestamps = [entry[1] for _isRemoval, entry in lwwSet.changesSince(n // 2)]
+                self.assertEqual(timestamps, sorted(timestamps))
+        
+        self.runConcurrently(write, read, read)
+        
+        self.assertIsNone(lwwSet._snapshots)  # the queries do not take snapshots
+        self.assertEqual(len(list(lwwSet.changesSince(0))), n)
+        
+    def testConcurrentMapUpdates(self):
+        lwwMap = LWWMap().makeThreadSafe()
+        
+        def write(offset):
+            for i in range(1000):
+                lwwMap.update("key{}".format(i % 10), offset + i, offset + i)
+        
+        def read():
+            for _ in range(200):
+                set(lwwMap.keySet())
+                list(lwwMap.entrySet())
+        
+        self.runConcurrently(lambda: write(0), lambda: write(10000), read)
+        
+        self.assertEqual(lwwMap.size(), 10)
+        self.assertEqual(lwwMap.query("key9"), 10999)
+        
+    def testConcurrentGraphTraversal(self):
+        graph = LWWGraph().makeThreadSafe()
+        graph.addVertex(0, 1)
+        n = 500
+        
+        def write():
+            for i in range(1, n):
+                graph.addVertex(i, i)
+                graph.addEdgeWithName(i, i - 1, i, i)
+        
+        def read():
+            for _ in range(50):
+                visited = list(graph.breadthFirstSearch(0))
+                self.assertEqual(visited, list(range(len(visited))))
+        
+        self.runConcurrently(write, read)
+        
+        self.assertEqual(len(list(graph.depthFirstSearch(0))), n)
+        
+    def testConcurrentAdjacencyQueries(self):
+        graph = LWWGraph().makeThreadSafe()
+        graph.addVertex("a", 1)
+        graph.addVertex("b", 1)
+        for i in range(3):
+            graph.addEdgeWithName(i, "a", "b", 2 * i + 2)
+        switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        
+        def write():
+            for i in range(3, 1000):
+                graph.addEdgeWithName(i, "a", "b", 2 * i + 2)
+                graph.removeEdgeByName(i - 3, 2 * i + 3)
+        
+        def read():
+            for _ in range(3000):
+                self.assertEqual(set(graph.getAdjacencyListForVertex("a")), {"b"})
+                self.assertEqual(set(graph.getIncomingAdjacencyListForVertex("b")), {"a"})
+                graph.edgeExistsWithName(500)
+        
+        try:
+            self.runConcurrently(write, read, read)
+        finally:
+            sys.setswitchinterval(switchInterval)
+        
+        self.assertEqual(graph.getAdjacencyListForVertex("a"), ["b", "b", "b"])
+        
+    def testGraphPartsShareTheLock(self):
+        graph = LWWGraph().makeThreadSafe()
+        
+        self.assertTrue(graph.isThreadSafe())
+        self.assertIs(graph._LWWGraph__vertices._lock, graph._lock)
+        self.assertIs(graph._LWWGraph__edges._lock, graph._lock)
+        
+    def testConcurrentRegisterUpdates(self):
+        register = LWWRegister().makeThreadSafe()
+        
+        def write(offset):
+            for i in range(1000):
+                register.update(offset + i, offset + i)
+        
+        self.runConcurrently(lambda: write(0), lambda: write(5000))
+        
+        self.assertEqual(register.query(), 5999)
+        self.assertEqual(register.getTimestamp(), 5999)
+        
+    def testCloningKeepsThreadSafeMode(self):
+        lwwSet = LWWSet().makeThreadSafe()
+        lwwSet.add("element1", 10)
+        register = LWWRegister("value1", 10).makeThreadSafe()
+        
+        setClone = copy.deepcopy(lwwSet)
+        registerClone = copy.deepcopy(register)
+        
+        self.assertTrue(setClone.isThreadSafe())
+        self.assertIsNot(setClone._lock, lwwSet._lock)
+        self.assertTrue(setClone.lookup("element1"))
+        self.assertTrue(registerClone.isThreadSafe())
+        self.assertEqual(registerClone.query(), "value1")
+        self.assertFalse(copy.deepcopy(LWWSet()).isThreadSafe())
+
+
+if __name__ == "__main__":
+    unittest.main()
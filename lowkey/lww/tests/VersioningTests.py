@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+import unittest
+import weakref
+
+from lowkey.lww.LWWColumnarSet import LWWColumnarSet
+from lowkey.lww.LWWGraph import LWWGraph
+from lowkey.lww.LWWMap import LWWMap
+from lowkey.lww.LWWRegister import LWWRegister
+from lowkey.lww.LWWSet import LWWSet
+from lowkey.lww.LWWVersionedMap import LWWVersionedMap
+from lowkey.lww.LWWVertex import LWWVertex
+
+__author__ = "Istvan David"
+__copyright__ = "Copyright 2021, GEODES"
+__credits__ = "Eugene Syriani"
+__license__ = "GPL-3.0"
+
+
+class VersioningTests(unittest.TestCase):
+    
+    def testUnchangedStructure(self):
+        lwwMap = LWWMap()
+        lwwMap.add("key", "value", 10)
+        version = lwwMap.getVersion()
+        
+        lwwMap.lookup("key")
+        
+        self.assertFalse(lwwMap.changedSince(version))
+    
+    def testSetInRegister(self):
+        lwwSet = LWWSet()
+        register = LWWRegister(lwwSet, 10)
+        version = register.getVersion()
+        
+        lwwSet.add("element", 20)
+        
+        self.assertTrue(register.changedSince(version))
+    
+    def testMapInMap(self):
+        inner = LWWMap()
+        outer = LWWMap()
+        outer.add("inner", inner, 10)
+        version = outer.getVersion()
+        self.assertFalse(outer.changedSince(version))
+        
+        inner.add("key", "value", 20)
+        
+        self.assertTrue(outer.changedSince(version))
+    
+    def testTransitiveNesting(self):
+        innermost = LWWSet()
+        inner = LWWMap()
+        inner.add("set", (innermost, 1), 10)
+        outer = LWWMap()
+        outer.add("map", inner, 10)
+        version = outer.getVersion()
+        
+        innermost.add("element", 20)
+        
+        self.assertTrue(outer.changedSince(version))
+    
+    def testMutualNesting(self):
+        map1 = LWWMap()
+        map2 = LWWMap()
+        map1.add("other", map2, 10)
+        map2.add("other", map1, 10)
+        version1 = map1.getVersion()
+        version2 = map2.getVersion()
+        
+        map1.add("key", "value", 20)
+        
+        self.assertEqual(map1.getVersion(), version1 + 1)
+        self.assertEqual(map2.getVersion(), version2 + 1)
+    
+    def testGraphVertexChange(self):
+        graph = LWWGraph()
+        vertex = LWWVertex()
+        graph.addVertex(vertex, 10)
+        version = graph.getVersion()
+        
+        vertex.add("name", "v", 20)
+        
+        self.assertTrue(graph.changedSince(version))
+    
+    def testColumnarSetAndVersionedMapInMap(self):
+        columnarSet = LWWColumnarSet()
+        versionedMap = LWWVersionedMap()
+        outer = LWWMap()
+        outer.add("set", columnarSet, 10)
+        outer.add("map", versionedMap, 10)
+        
+        version = outer.getVersion()
+        columnarSet.add("element", 20)
+        self.assertTrue(outer.changedSince(version))
+        
+        version = outer.getVersion()
+        versionedMap.add("key", "value", 20)
+        self.assertTrue(outer.changedSince(version))
+    
+    def testStructureInTwoContainers(self):
+        inner = LWWSet()
+        first = LWWMap()
+        second = LWWMap()
+        first.add("inner", inner, 10)
+        self.assertIsInstance(inner._containers, weakref.ref)  # a single container is referenced directly
+        second.add("inner", inner, 10)
+        
+        firstVersion = first.getVersion()
+        secondVersion = second.getVersion()
+        inner.add("element", 20)
+        
+        self.assertTrue(first.changedSince(firstVersion))
+        self.assertTrue(second.changedSince(secondVersion))
+    
+    def testFreedContainerIsNotNotified(self):
+        inner = LWWRegister("value", 10)
+        outer = LWWMap()
+        outer.add("inner", inner, 10)
+        del outer
+        
+        inner.update("value2", 20)
+        
+        self.assertEqual(inner.query(), "value2")
+    
+    def testSnapshotIsNotNotified(self):
+        inner = LWWSet()
+        outer = LWWMap()
+        outer.add("inner", inner, 10)
+        snapshot = outer.snapshot()
+        version = snapshot.getVersion()
+        
+        inner.add("element", 20)
+        
+        self.assertFalse(snapshot.changedSince(version))
+        self.assertTrue(outer.changedSince(version))
+
+
+if __name__ == "__main__":
+    unittest.main()